@@ -1,13 +1,33 @@
 # IMPORTS
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_request_context
+from flask_socketio import SocketIO, ConnectionRefusedError, join_room
 import html
-import re
-from snowflakeConfig import STUDENT_DEFAULT_PASSWORD, init_snowflake_connection, COMPANY_PASSWORD
+from contextlib import contextmanager
+from snowflakeConfig import STUDENT_DEFAULT_PASSWORD, init_snowflake_connection, migrate_snowflake_schema, COMPANY_PASSWORD, PLACEMENT_OFFICE_PASSWORD
+from snowflakeConfig import init_snowflake_read_connection, SNOWFLAKE_READ_WAREHOUSE, SNOWFLAKE_READ_POOL_SIZE, SNOWFLAKE_POOL_SIZE, READ_REPLICA_DIRECTORY
+from snowflakeConfig import SHARDING_MODE, SHARD_SQLITE_DIRECTORY, SHARD_SCHEMAS, SHARD_POOL_SIZE
+from dbResilience import CircuitBreaker, CircuitOpenError, PoolSaturatedError, WriteConflictError, StaleCache, call_with_resilience, STATEMENT_TIMEOUT_SECONDS
+from dbRouting import ConnectionPool, create_write_tracker, is_read_statement, student_session, company_session, READ_YOUR_WRITES_COOKIE
+from dbSharding import create_shard_router, create_replica_factories, VALID_BRANCHES
+from rateLimiter import create_rate_limiter, DEFAULT_COST_CLASS
+from requestSchema import RequestSchema, Field
+from records import Student, Company, applications_from_rows, companies_from_rows, students_from_rows
+from placementMatcher import run_placement_drive
+from notifications import LocalBroker, StudentPresence, CATALOG_TOPIC, student_topic, company_topic
+from searchIndex import CompanySearchIndex
+from responseEncoder import FastJSONProvider, company_eligibility_fragments, eligibility_entry_bytes, json_bytes_response, json_member
+from reportExport import csv_response, REPORT_BATCH_ROWS, REPORT_STATEMENT_TIMEOUT_SECONDS
 
 #--------------------------------------------------------------------------------------------------------------------------------------------------
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson-backed jsonify with stdlib fallback
+
+# Real-time channel for application status and new company notifications
+socketio = SocketIO(app)
+notification_broker = LocalBroker()  # swap for a shared broker when running several instances
+student_presence = StudentPresence()
 
 # Initialize Snowflake connection
 def initialize_connection():
@@ -20,46 +40,419 @@ def initialize_connection():
         print(f"Error initializing Snowflake connection: {e}")
         return None
 
-conn = initialize_connection()
+# Branch shards replace the primary pool when a sharding mode is configured
+shard_router, shard_directory = create_shard_router(SHARDING_MODE, SHARD_SQLITE_DIRECTORY, SHARD_SCHEMAS, init_snowflake_connection, SHARD_POOL_SIZE)
+
+# Without shards the primary is a small pool as well, so every operation (and every BEGIN ... COMMIT) runs on a
+# connection no other request is using. The startup connection fails fast on a bad configuration and is pooled.
+conn = initialize_connection() if shard_router is None else None
+primary_pool = ConnectionPool(initialize_connection, SNOWFLAKE_POOL_SIZE) if shard_router is None else None
+if conn is not None:
+    primary_pool.add(conn)
+
+# Bring the Snowflake tables up to date before serving: the primary, or every shard schema when sharded on Snowflake
+def migrate_databases():
+    if shard_router is None:
+        pools = [primary_pool]
+    elif SHARDING_MODE == 'snowflake':
+        pools = list(shard_router.pools.values())
+    else:
+        return
+    for pool in pools:
+        try:
+            with pool.connection() as connection:
+                migrate_snowflake_schema(connection)
+        except Exception as e:
+            print(f"Error migrating Snowflake schema: {e}")
+
+migrate_databases()
+
+# Failure-aware call layer shared by every database access (one breaker per shard when sharded)
+breaker = CircuitBreaker()
+shard_breakers = {branch: CircuitBreaker() for branch in shard_router.branches} if shard_router is not None else {}
+stale_cache = StaleCache()
+
+# Reads go to read-only pools when configured (one per shard when sharded); writes always go to the primary
+if shard_router is None:
+    read_factories = {None: init_snowflake_read_connection} if SNOWFLAKE_READ_WAREHOUSE else {}
+else:
+    read_factories = create_replica_factories(SHARDING_MODE, READ_REPLICA_DIRECTORY, SHARD_SCHEMAS,
+                                              init_snowflake_read_connection if SNOWFLAKE_READ_WAREHOUSE else None)
+read_pools = {shard: ConnectionPool(factory, SNOWFLAKE_READ_POOL_SIZE) for shard, factory in read_factories.items()}
+read_breakers = {shard: CircuitBreaker() for shard in read_pools}
+write_tracker = create_write_tracker()
+
+# The student/company a request acts for, used to keep its reads on the primary after it writes
+@app.before_request
+def identify_database_session():
+    data = request.get_json(silent=True) if request.is_json else None
+    data = data if isinstance(data, dict) else {}
+    session_keys = []
+    for field, session_key in (('student_id', student_session), ('company_id', company_session)):
+        value = request.args.get(field) or data.get(field)
+        if isinstance(value, str) and value:
+            session_keys.append(session_key(value))
+    g.database_session_keys = session_keys
+
+def current_session_keys():
+    if has_request_context():
+        return getattr(g, 'database_session_keys', [])
+    return []
+
+# Function to tell whether this request's reads must stay on the primary: the client wrote recently
+# (its cookie says so) or a write changed one of the sessions it acts for
+def must_read_primary():
+    last_write_marker = request.cookies.get(READ_YOUR_WRITES_COOKIE) if has_request_context() else None
+    return write_tracker.must_read_primary(current_session_keys(), last_write_marker)
+
+# Function to record a write for read-your-writes (the request's sessions plus the ones it affects)
+def record_write(affects=()):
+    written_at = write_tracker.record_write(current_session_keys() + list(affects))
+    if has_request_context():
+        g.last_write_at = written_at
+
+# Hand the writing client its last write time, so any instance keeps its next reads on the primary
+@app.after_request
+def set_last_write_cookie(response):
+    written_at = g.get('last_write_at')
+    if written_at is not None:
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, repr(written_at), max_age=write_tracker.window_seconds, httponly=True, samesite='Lax')
+    return response
+
+# Rate limiting and admission control. Before any database work every request is charged to its client
+# address and takes an in-flight slot of its route's cost class. Expensive and batch routes also charge the
+# student, company or placement office they act for, per route, but only once its credentials passed, so
+# nobody can spend another principal's tokens by sending their id.
+rate_limiter = create_rate_limiter()
+PLACEMENT_OFFICE_PRINCIPAL = "placement_office"
+
+ROUTE_COST_CLASSES = {
+    'student_eligibilty':           'expensive',
+    'display_company_applications': 'expensive',
+    'run_drive':                    'batch',
+    'apply_branch_marks':           'batch',
+    'export_applications_report':   'batch',
+    'export_placed_students_report': 'batch',
+}
+UNLIMITED_ROUTES = {'home', 'metrics', 'static'}
+
+# Function to build the 429/503 response of a refused request
+def throttled_response(status, retry_after):
+    if status == 429:
+        response = jsonify({"error": "Too many requests, please retry later"})  # Too Many Requests - bucket empty
+    else:
+        response = jsonify({"error": "Server busy, please retry later"})  # Service Unavailable - load shed
+    response.headers['Retry-After'] = str(retry_after)
+    return response, status
 
-# Function to fetch student data from Snowflake database
-def get_student_data_from_snowflake(student_id):
-    cursor = conn.cursor()
+@app.before_request
+def admit_request():
+    if request.endpoint is None or request.endpoint in UNLIMITED_ROUTES:
+        return None
+    cost_class = ROUTE_COST_CLASSES.get(request.endpoint, DEFAULT_COST_CLASS)
+
+    # Nothing is authenticated yet, so the client address is the only principal to charge
+    status, retry_after = rate_limiter.throttle(f"ip:{request.remote_addr}", DEFAULT_COST_CLASS)
+    if status is None:
+        status, retry_after = rate_limiter.enter(cost_class)
+    if status is not None:
+        return throttled_response(status, retry_after)
+    g.admitted_cost_class = cost_class
+
+# Function to charge an authenticated principal for the current expensive or batch route; returns a response when refused
+def charge_principal(principal):
+    cost_class = ROUTE_COST_CLASSES.get(request.endpoint, DEFAULT_COST_CLASS)
+    status, retry_after = rate_limiter.throttle(f"{request.endpoint}:{principal}", cost_class)
+    if status is not None:
+        return throttled_response(status, retry_after)
+    return None
+
+@app.teardown_request
+def release_request(exception):
+    cost_class = g.pop('admitted_cost_class', None)
+    if cost_class is not None:
+        rate_limiter.release(cost_class)
+
+# Borrow a pooled primary connection for one operation (the shard's when sharded).
+# Everything from BEGIN to commit has to run inside the same with block.
+@contextmanager
+def database_connection(shard=None):
+    pool = primary_pool if shard is None else shard_router.pools[shard]
+    with pool.connection() as connection:
+        yield connection
+
+# Function to run a read query (retried, served stale from cache on request when the database is unavailable).
+# use_replica=False keeps a read on the primary when a lagging replica could give the wrong answer.
+def run_read_query(query, params=(), fetch='one', allow_stale=False, shard=None, use_replica=True):
+    def fetch_rows(connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, params, timeout=STATEMENT_TIMEOUT_SECONDS)
+            return cursor.fetchone() if fetch == 'one' else cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def replica_operation():
+        with read_pools[shard].connection() as connection:
+            return fetch_rows(connection)
+
+    def primary_operation():
+        with database_connection(shard) as connection:
+            return fetch_rows(connection)
+
+    cache_key = (shard, query, tuple(params))
+
+    # Replica first unless this session wrote recently; any replica failure falls back to the primary
+    if use_replica and shard in read_pools and is_read_statement(query) and not must_read_primary():
+        try:
+            rows = call_with_resilience(replica_operation, read_breakers[shard], idempotent=True)
+            if allow_stale:
+                stale_cache.put(cache_key, rows)
+            return rows
+        except Exception as e:
+            print(f"Read replica unavailable, using primary: {e}")
+
+    return call_with_resilience(primary_operation, breaker_for(shard), idempotent=True, stale_cache=stale_cache,
+                                cache_key=cache_key, allow_stale=allow_stale)
+
+# Function to run a read on every shard in parallel and concatenate the rows (a plain fetchall when unsharded).
+# The shard threads have no request context, so read-your-writes is decided here, in the request thread.
+def run_read_query_all_shards(query, params=(), allow_stale=False):
+    if shard_router is None:
+        return run_read_query(query, params, fetch='all', allow_stale=allow_stale)
+    use_replica = not must_read_primary()
+    results = shard_router.scatter_gather(lambda branch: run_read_query(query, params, fetch='all', allow_stale=allow_stale, shard=branch,
+                                                                        use_replica=use_replica))
+    return [row for rows in results for row in rows]
+
+# Function to stream a read query's rows in fetchmany batches (memory bounded by one batch).
+# Opening the cursor goes through the breaker and is retried; reads use the replica pool when configured.
+def stream_read_query(query, params=(), shard=None):
+    def stream(connection, query_breaker):
+        def open_cursor():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params, timeout=REPORT_STATEMENT_TIMEOUT_SECONDS)
+            except Exception:
+                cursor.close()
+                raise
+            return cursor
+
+        cursor = call_with_resilience(open_cursor, query_breaker, idempotent=True)
+        try:
+            while True:
+                rows = cursor.fetchmany(REPORT_BATCH_ROWS)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    if shard in read_pools:
+        with read_pools[shard].connection() as connection:
+            yield from stream(connection, read_breakers[shard])
+    else:
+        with database_connection(shard) as connection:
+            yield from stream(connection, breaker_for(shard))
+
+# Function to list the databases a report reads, one after another (a branch filter needs only its shard)
+def report_shards(branch=None):
+    if shard_router is None:
+        return [None]
+    return [branch] if branch else sorted(shard_router.branches)
+
+# Function to run write statements and commit them together (never retried); returns the rows they changed.
+# affects lists extra sessions whose data the write changes (the request's own session is always included).
+def run_write_statements(statements, affects=(), shard=None):
+    def operation():
+        with database_connection(shard) as connection:
+            cursor = connection.cursor()
+            try:
+                changed_rows = 0
+                for query, params in statements:
+                    cursor.execute(query, params, timeout=STATEMENT_TIMEOUT_SECONDS)
+                    changed_rows += max(cursor.rowcount or 0, 0)
+                connection.commit()
+                return changed_rows
+            finally:
+                cursor.close()
     try:
-        cursor.execute("SELECT * FROM STUDENT WHERE ID = %s", (student_id,))
-        specific_student_data = cursor.fetchone()
-    except Exception as e:
-        raise e
+        return call_with_resilience(operation, breaker_for(shard))
     finally:
-        cursor.close()
-    return specific_student_data  # specific studentID data
-
-# Function to fetch company data from Snowflake database
-def get_company_data_from_snowflake():
-    cursor = conn.cursor()
+        # even a failed write may have partly applied, so read it back from the primary
+        record_write(affects)
+
+# Function to run batches of (query, rows) with executemany inside one explicit transaction; returns the rows changed.
+# With expected_rows the transaction is rolled back (WriteConflictError) unless exactly that many rows changed.
+def run_bulk_write_statements(batches, affects=(), shard=None, expected_rows=None):
+    def operation():
+        with database_connection(shard) as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("BEGIN", timeout=STATEMENT_TIMEOUT_SECONDS)
+                changed_rows = 0
+                for query, rows in batches:
+                    if rows:
+                        cursor.executemany(query, rows)
+                        changed_rows += max(cursor.rowcount or 0, 0)
+                if expected_rows is not None and changed_rows != expected_rows:
+                    raise WriteConflictError(f"Expected {expected_rows} rows to change, {changed_rows} did")
+                connection.commit()
+                return changed_rows
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
     try:
-        cursor.execute("SELECT * FROM COMPANY")
-        company_data = cursor.fetchall()
-    except Exception as e:
-        raise e
+        return call_with_resilience(operation, breaker_for(shard))
     finally:
-        cursor.close()
-    return company_data  # all company data
+        record_write(affects)
+
+def breaker_for(shard):
+    return shard_breakers[shard] if shard is not None else breaker
+
+# Function to pick the shard for a branch (None when sharding is off)
+def branch_shard(branch):
+    return branch if shard_router is not None else None
+
+SHARD_LOOKUP_QUERIES = {
+    'student': "SELECT BRANCH FROM STUDENT WHERE ID = %s",
+    'company': "SELECT BRANCH FROM COMPANY WHERE ID = %s",
+}
+
+# Function to find the shard of a student or company id; returns (found, shard).
+# The directory is a local cache that another instance's inserts never reach, so a miss asks every shard
+# (on the primary) and remembers the answer.
+def locate_shard(kind, entity_id):
+    if shard_router is None:
+        return True, None
+    branch = shard_directory.branch_of(kind, entity_id)
+    if branch is None:
+        rows = shard_router.scatter_gather(lambda shard: run_read_query(SHARD_LOOKUP_QUERIES[kind], (entity_id,), shard=shard, use_replica=False))
+        branch = next((shard for shard, row in zip(shard_router.branches, rows) if row is not None), None)
+        if branch is not None:
+            shard_directory.register(kind, entity_id, branch)
+    return branch is not None, branch
+
+# Function to find the shard holding an application id; returns (found, shard)
+def locate_application_shard(application_id):
+    if shard_router is None:
+        return True, None
+    branch = shard_router.branch_for_application(application_id)
+    return branch is not None, branch
+
+# Function to notify the student and the company about an application decision
+def publish_application_status(student_id, company_id, application_id, status):
+    payload = {"application_id": application_id, "student_id": student_id, "company_id": company_id, "status": status}
+    notification_broker.publish(student_topic(student_id), "application_status", payload)
+    notification_broker.publish(company_topic(company_id), "application_status", payload)
+    if status == 'Accept':
+        student_presence.remove_student(student_id)
+
+# Function to build the response for a failed database call
+def database_error_response(e):
+    if isinstance(e, CircuitOpenError):
+        response = jsonify({"error": str(e)})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503 # Service Unavailable - fail fast while the breaker is open
+    if isinstance(e, PoolSaturatedError):
+        return throttled_response(503, e.retry_after)
+    return jsonify({"error": str(e)}), 500 # Internal Server Error
+
+# Breaker errors raised outside a route's own try block
+@app.errorhandler(CircuitOpenError)
+def handle_circuit_open(e):
+    return database_error_response(e)
+
+# Pool saturation raised outside a route's own try block
+@app.errorhandler(PoolSaturatedError)
+def handle_pool_saturated(e):
+    return database_error_response(e)
+
+STUDENT_BY_ID_QUERY = "SELECT * FROM STUDENT WHERE ID = %s"
+
+# Function to fetch student data from Snowflake database
+def get_student_data_from_snowflake(student_id, allow_stale=False, use_replica=True):
+    found, shard = locate_shard('student', student_id)
+    if not found:
+        return None
+    row = run_read_query(STUDENT_BY_ID_QUERY, (student_id,), allow_stale=allow_stale, shard=shard, use_replica=use_replica)
+    return Student.from_row(row)  # specific studentID data
+
+# Function to refresh what is derived from one student's row after their marks changed:
+# the cached row served during outages and the percentage used to filter catalog notifications
+def refresh_student_dependents(student, shard=None):
+    stale_cache.refresh((shard, STUDENT_BY_ID_QUERY, (student.student_id,)), student.to_row())
+    student_presence.update_percentage(student.student_id, student.percentage)
+
+# Function to fetch company data from Snowflake database
+def get_company_data_from_snowflake(allow_stale=False):
+    rows = run_read_query_all_shards("SELECT * FROM COMPANY", allow_stale=allow_stale)
+    return companies_from_rows(rows)  # all company data
 
-def get_specific_company_data_from_snowflake(company_id):
-    cursor = conn.cursor()
+def get_specific_company_data_from_snowflake(company_id, allow_stale=False):
+    found, shard = locate_shard('company', company_id)
+    if not found:
+        return None
+    row = run_read_query("SELECT * FROM COMPANY WHERE ID = %s", (company_id,), allow_stale=allow_stale, shard=shard)
+    return Company.from_row(row)  # specific companyID data
+
+# Function to fetch a student's applications with company names.
+# Sharded, the company can live on another shard, so the join is done here instead of in SQL.
+def get_applications_of_student(student):
+    if shard_router is None:
+        rows = run_read_query("""
+            SELECT
+                APPLICATION.APPLICATION_ID,
+                APPLICATION.STUDENT_ID,
+                APPLICATION.COMPANY_ID,
+                APPLICATION.STATUS,
+                COMPANY.COMPANY_NAME
+            FROM
+                APPLICATION
+            JOIN COMPANY ON APPLICATION.COMPANY_ID = COMPANY.ID
+            WHERE
+                APPLICATION.STUDENT_ID = %s
+        """, (student.student_id,), fetch='all')
+        return applications_from_rows(rows)
+
+    rows = run_read_query("SELECT APPLICATION_ID, STUDENT_ID, COMPANY_ID, STATUS FROM APPLICATION WHERE STUDENT_ID = %s",
+                          (student.student_id,), fetch='all', shard=student.branch)
+    applications = []
+    companies = {}
+    for application in applications_from_rows(rows):
+        if application.company_id not in companies:
+            companies[application.company_id] = get_specific_company_data_from_snowflake(application.company_id)
+        company = companies[application.company_id]
+        if company is not None:  # same as the inner join: skip applications to deleted companies
+            application.company_name = company.name
+            applications.append(application)
+    return applications
+
+# Function to rebuild the id -> branch directory from the shards themselves
+def rebuild_shard_directory():
+    entries = [('student', row[0], row[1]) for row in run_read_query_all_shards("SELECT ID, BRANCH FROM STUDENT")]
+    entries += [('company', row[0], row[1]) for row in run_read_query_all_shards("SELECT ID, BRANCH FROM COMPANY")]
+    shard_directory.rebuild(entries)
+
+if shard_directory is not None and shard_directory.is_empty():
     try:
-        cursor.execute("SELECT * FROM COMPANY WHERE ID = %s", (company_id,))
-        specific_company_data = cursor.fetchone()
+        rebuild_shard_directory()
     except Exception as e:
-        raise e
-    finally:
-        cursor.close()
-    return specific_company_data  # specific companyID data
+        print(f"Error rebuilding the shard directory: {e}")
+
+# In-memory search index over the company catalog, built from COMPANY on first use
+company_index = CompanySearchIndex()
+
+def get_company_index():
+    if not company_index.built:
+        company_index.build(get_company_data_from_snowflake(allow_stale=True))
+    return company_index
 
 # Student validation
-def validate_student_credentials(student_id, password):
-    student_data = get_student_data_from_snowflake(student_id)  # specific studentID data
+def validate_student_credentials(student_id, password, allow_stale=False):
+    student_data = get_student_data_from_snowflake(student_id, allow_stale=allow_stale)  # specific studentID data
     if not student_data:
         return {"error": f"Student ID {student_id} doesn't exist"}, 404
     if not password:
@@ -70,8 +463,8 @@ def validate_student_credentials(student_id, password):
         return student_data, 200 # OK
 
 # Function to validate company
-def validate_company_credentials(company_id,company_password):
-    specific_company_data = get_specific_company_data_from_snowflake(company_id)  # specific companyID data
+def validate_company_credentials(company_id,company_password, allow_stale=False):
+    specific_company_data = get_specific_company_data_from_snowflake(company_id, allow_stale=allow_stale)  # specific companyID data
     if not specific_company_data:
         return {"error": f"Company ID {company_id} doesn't exist"}, 404
     if not company_password:
@@ -82,29 +475,25 @@ def validate_company_credentials(company_id,company_password):
         return specific_company_data, 200 # OK
 
 # Function to get the eligible company of a student by ID
-def get_eligible_companies(student_percentage):
+def get_eligible_companies(student_percentage, allow_stale=False):
     eligible_companies = []
-    companies = get_company_data_from_snowflake()
+    companies = get_company_data_from_snowflake(allow_stale=allow_stale)
     for company in companies:
-        if student_percentage >= float(company[2]): # Required Percentage by the company
+        if student_percentage >= company.required_percentage: # Required Percentage by the company
             eligible_companies.append(company)
     return eligible_companies
 
-# Function to find the matching skills
-def get_matching_skills(student_skills, company_required_skills):
-    if not student_skills:
-        return []
-    student_skills_set = set(skill.strip() for skill in student_skills.split(','))
-    company_skills_set = set(skill.strip() for skill in company_required_skills.split(','))
-    matching_skills = student_skills_set.intersection(company_skills_set)
-    return list(matching_skills), student_skills_set, company_skills_set
+# Function to find the matching skills (skills are pre-parsed on the records, the company's as a set)
+def get_matching_skills(student, company):
+    matching_skills = [skill for skill in student.skills if skill in company.skills]
+    return matching_skills, student.skills, company.skills
 
 # Function to calculate placement likelihood
 def calculate_placement_likelihood(student_data, company, weight=0.5, branch_weight=0.2):
-    student_percentage = float(student_data[5])
-    required_percentage = float(company[2])
+    student_percentage = student_data.percentage
+    required_percentage = company.required_percentage
     if student_percentage >= required_percentage:
-        matching_skills, student_skills, company_required_skills = get_matching_skills(student_data[7], company[4])
+        matching_skills, student_skills, company_required_skills = get_matching_skills(student_data, company)
         
         # If there are no required skills specified, return 25% as a default
         if not company_required_skills:
@@ -113,11 +502,11 @@ def calculate_placement_likelihood(student_data, company, weight=0.5, branch_wei
         # matching skills percentage likelihood
         skills_match_percentage = (len(matching_skills) / len(company_required_skills)) * 100
 
-        # percentage likelihood
-        percentage_match = (student_percentage / required_percentage) * 100
+        # percentage likelihood (no percentage requirement adds nothing, as in the placement drive)
+        percentage_match = (student_percentage / required_percentage) * 100 if required_percentage > 0 else 0
 
         # Adjust likelihood based on branch match
-        branch_match = 1 if student_data[6] == company[3] else 0
+        branch_match = 1 if student_data.branch == company.branch else 0
 
         # Net - likelihood
         likelihood = ((skills_match_percentage + percentage_match) * weight) + (branch_match * branch_weight)
@@ -159,91 +548,121 @@ def calculate_percentage(semester_wise_marks):
         # Handle the case where division by zero might occur
         raise ZeroDivisionError("Number of subjects is zero, cannot calculate percentage")
 
-#Function to Validate the given data
-def validate_data_types_for_student_Add(data):
+# Request schemas, compiled once at startup into single-pass validators (see requestSchema.py).
+# Messages match the checks the routes used to run inline.
+STUDENT_LOGIN_SCHEMA = RequestSchema(
+    Field('student_id', injection=True),
+    Field('password', injection=True),
+    missing_message="Missing student_id or password",
+)
+
+COMPANY_LOGIN_SCHEMA = RequestSchema(
+    Field('company_id', injection=True, type_message="Invalid input"),
+    Field('company_password', injection=True, type_message="Invalid input"),
+    missing_message="Missing company_id or company_password",
+)
+
+STUDENT_ADD_SCHEMA = RequestSchema(
+    Field('student_id'),
+    Field('name'),
+    Field('branch', choices=VALID_BRANCHES, invalid_message=f"branch should be one of {VALID_BRANCHES}"),
+    Field('admission_year'),
+    Field('placed', required=False, default='No'),
+    Field('semester_wise_marks', pattern=r" *[+-]?\d+ *(?:, *[+-]?\d+ *)*",
+          invalid_message="semester_wise_marks should contain valid integers separated by commas"),
+    Field('certified_skills', required=False, default=''),
+)
+
+UPDATE_SKILLS_SCHEMA = RequestSchema(
+    Field('student_id', injection=True),
+    Field('password', injection=True),
+    Field('new_skills', kind=list, type_message="new_skills should be a list of skills",
+          items=Field('skill', type_message="new_skills should be a list of skills")),
+    missing_message="Missing student_id, password, or new_skills",
+)
+
+APPLY_SCHEMA = RequestSchema(
+    Field('student_id', injection=True),
+    Field('password', injection=True),
+    Field('company_id', injection=True),
+    missing_message="Missing student_id, password, or company_id",
+)
+
+COMPANY_ADD_SCHEMA = RequestSchema(
+    Field('company_id', injection=True),
+    Field('name', injection=True),
+    Field('brief_description', injection=True),
+    Field('required_percentage', kind=float, minimum=0.01, maximum=100, type_message="required_percentage should be a float",
+          invalid_message="required_percentage should be greater than 0 and at most 100"),
+    Field('branch', injection=True),
+    Field('required_skills', injection=True),
+    missing_message="Missing required company details",
+)
+
+APPLICATION_UPDATE_SCHEMA = RequestSchema(
+    Field('application_id', injection=True, type_message="Application ID should be a string"),
+    Field('status', injection=True, choices=['accept', 'reject'], type_message="Status should be a string",
+          invalid_message="Invalid status. Must be 'accept' or 'reject'"),
+    Field('company_id', injection=True, type_message="Company ID should be a string"),
+    Field('company_password', injection=True, type_message="Company password should be a string"),
+    missing_message="Missing application_id, company_id, company_password, or status",
+)
+
+POSITIVE_INTEGER_PATTERN = r"0*[1-9][0-9]*"
+
+COMPANY_SEARCH_SCHEMA = RequestSchema(
+    Field('q'),
+    Field('limit', required=False, default='20', pattern=POSITIVE_INTEGER_PATTERN, invalid_message="limit should be a positive integer"),
+    missing_message="Missing search query q",
+)
+
+SKILL_AUTOCOMPLETE_SCHEMA = RequestSchema(
+    Field('prefix', pattern=r"(?s).*\S.*", invalid_message="Missing prefix"),
+    Field('limit', required=False, default='10', pattern=POSITIVE_INTEGER_PATTERN, invalid_message="limit should be a positive integer"),
+    missing_message="Missing prefix",
+)
+
+PLACEMENT_DRIVE_SCHEMA = RequestSchema(
+    Field('password'),
+    Field('dry_run', kind=bool, required=False, default=True),
+    Field('default_seats', kind=int, required=False, default=1, minimum=0,
+          type_message="default_seats should be a non-negative integer", invalid_message="default_seats should be a non-negative integer"),
+    Field('seats', kind=dict, required=False, default={}, type_message="seats should be an object of company_id to seat count",
+          items=Field('seat_count', kind=int, minimum=0, type_message="seats for company {key} should be a non-negative integer",
+                      invalid_message="seats for company {key} should be a non-negative integer")),
+    missing_message="Missing password",
+)
+
+REPORT_SCHEMA = RequestSchema(
+    Field('password'),
+    Field('branch', required=False, choices=VALID_BRANCHES, invalid_message=f"branch should be one of {VALID_BRANCHES}"),
+    Field('admission_year', required=False, pattern=r"[0-9]{4}", invalid_message="admission_year should be a 4 digit year"),
+    missing_message="Missing password",
+)
+
+MARKS_UPDATE_SCHEMA = RequestSchema(
+    Field('student_id', injection=True),
+    Field('password'),
+    Field('semester_marks', kind=int, minimum=0, maximum=100, type_message="semester_marks should be an integer between 0 and 100",
+          invalid_message="semester_marks should be an integer between 0 and 100"),
+    Field('semester', kind=int, required=False, minimum=1, type_message="semester should be a positive integer",
+          invalid_message="semester should be a positive integer"),
+    missing_message="Missing student_id, password, or semester_marks",
+)
+
+BRANCH_MARKS_SCHEMA = RequestSchema(
+    Field('password'),
+    Field('branch', choices=VALID_BRANCHES, type_message=f"branch should be one of {VALID_BRANCHES}",
+          invalid_message=f"branch should be one of {VALID_BRANCHES}"),
+    Field('semester', kind=int, minimum=1, type_message="semester should be a positive integer",
+          invalid_message="semester should be a positive integer"),
+    Field('results', kind=dict, type_message="results should be a non-empty object of student_id to semester marks",
+          items=Field('semester_marks', kind=int, minimum=0, maximum=100,
+                      type_message="semester_marks for student {key} should be an integer between 0 and 100",
+                      invalid_message="semester_marks for student {key} should be an integer between 0 and 100")),
+    missing_message="Missing password, branch, semester, or results",
+)
 
-    required_fields = ['student_id', 'name', 'branch', 'admission_year', 'semester_wise_marks']
-    for field in required_fields:
-        if field not in data or not data[field]:
-            return f"{field} is required and should not be empty"
-        
-    if not isinstance(data.get('student_id'), str):
-        return "student_id should be a string"
-    if not isinstance(data.get('name'), str):
-        return "name should be a string"
-    if not isinstance(data.get('branch'), str):
-        return "branch should be a string"
-    if not isinstance(data.get('admission_year'), str):
-        return "admission_year should be a string"
-    if not isinstance(data.get('placed', 'No'), str):
-        return "placed should be a string"
-    if not isinstance(data.get('semester_wise_marks'), str):
-        return "semester_wise_marks should be a string"
-    if not isinstance(data.get('certified_skills', ''), str):
-        return "certified_skills should be a string"
-    
-    # Validate branch
-    valid_branches = ["CS", "CIVIL", "ELECTRONIC", "MECH", "IT"]
-    if data.get('branch') not in valid_branches:
-        return f"branch should be one of {valid_branches}"
-    
-    # Validate marks format
-    marks = data.get('semester_wise_marks')
-    try:
-        marks_list = marks.split(',')
-        for mark in marks_list:
-            int(mark)  # This will raise ValueError if conversion fails
-    except ValueError:
-        return "semester_wise_marks should contain valid integers separated by commas"
-
-    return None
-
-# Function to validate input data types for adding a company
-def validate_data_types_for_company(data):
-    if not isinstance(data.get('company_id'), str):
-        return "company_id should be a string"
-    if not isinstance(data.get('name'), str):
-        return "name should be a string"
-    if not isinstance(data.get('brief_description'), str):
-        return "brief_description should be a string"
-    if not isinstance(data.get('required_percentage'), (float, int)):  # Allow integer and float
-        return "required_percentage should be a float"
-    if not isinstance(data.get('branch'), str):
-        return "branch should be a string"
-    if not isinstance(data.get('required_skills'), str):
-        return "required_skills should be a string"
-    return None
-
-def validate_update_applications(application_update_data):
-    if not isinstance(application_update_data.get('application_id'),str):
-        return "Application ID should be a string"
-    if not isinstance(application_update_data.get('status'),str):
-        return "Status should be a string"
-    if not isinstance(application_update_data.get('company_id'),str):
-        return "Company ID should be a string"
-    if not isinstance(application_update_data.get('company_password'),str):
-        return "Company password should be a string"
-    if application_update_data.get('status') not in ['accept', 'reject']:
-        return "Invalid status. Must be 'accept' or 'reject'"
-    return None
-    
-def validate_data_types_update_skills(new_skills,student_id,password):
-    if not isinstance(new_skills,list):
-            return jsonify({"error": "new_skills should be a list of skills"}), 400 #Bad Request
-    if not isinstance(student_id,str):
-        return jsonify({"error": "student_id should be a string"}), 400 #Bad Request
-    if not isinstance(password,str):
-        return jsonify({"error": "password should be a string"}), 400 #Bad Request
-    return None
-
-def validate_data_types_apply_std_apply(student_id,password,company_id):
-    if not isinstance(student_id,str):
-        return "student_id should be a string"
-    if not isinstance(password,str):
-        return "password should be a string"
-    if not isinstance(company_id,str):
-        return "company_id should be a string"
-    return None
 #--------------------------------------------------------------------------------------------------------------------------------------------------
 # Route function to display th home page --------->                                 /
 
@@ -256,43 +675,35 @@ def home():
 def add_student():
     # Method to only accept POST method
     if request.method == 'POST':
-        student_data = request.json
-        student_id = student_data.get('student_id')
-        name = student_data.get('name')
-        branch = student_data.get('branch')
-        admission_year = student_data.get('admission_year')
-        placed = student_data.get('placed', 'No')  # Default to 'No'
-        semester_marks = student_data.get('semester_wise_marks')
-        certified_skills = student_data.get('certified_skills', '')
-
-        # Validate required fields
-        required_fields = ['student_id', 'name', 'branch', 'admission_year', 'semester_wise_marks']
-        for field in required_fields:
-            if not student_data.get(field):
-                return jsonify({"error": f"{field} is required and should not be empty"}), 400
-
-        # Validate data types
-        error = validate_data_types_for_student_Add(student_data)
+        # Validate required fields, data types, branch and marks format
+        student_data, error = STUDENT_ADD_SCHEMA.validate(request.json)
         if error:
-            return jsonify({"error": error}), 400  # Bad Request - Invalid Data Types
-        
+            return jsonify(error), 400  # Bad Request - Invalid Data Types
+
+        student_id = student_data['student_id']
+        name = student_data['name']
+        branch = student_data['branch']
+        admission_year = student_data['admission_year']
+        placed = student_data['placed']  # Default to 'No'
+        semester_marks = student_data['semester_wise_marks']
+        certified_skills = student_data['certified_skills']
+
         percentage = calculate_percentage(semester_wise_marks= semester_marks)
-        cursor = conn.cursor()
         try:
             # Check if student ID already exists
             existing_student = get_student_data_from_snowflake(student_id)
             if existing_student:
                 return jsonify({"error": "Student ID already exists"}), 409  # Conflict - ID already exists
 
-            cursor.execute(
+            run_write_statements([(
                 "INSERT INTO STUDENT (ID, NAME, BRANCH, ADMYEAR, PLACED, SEM_WISE, PERCENTAGE, CERTIFIED_SKILLS) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
                 (student_id, name, branch, admission_year, placed, semester_marks, percentage, certified_skills)
-            )
-            conn.commit()
+            )], shard=branch_shard(branch))
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
+
+        if shard_directory is not None:
+            shard_directory.register('student', student_id, branch)
 
         return jsonify({"message": "Student added successfully"}), 201  # Created
     
@@ -305,36 +716,25 @@ def add_student():
 def delete_student():
     # Method to only accept DELETE method
     if request.method == 'DELETE':
-        student_id = request.args.get('student_id')
-        password = request.args.get('password')
+        # Validate missing parameters, injection patterns and data types
+        values, error = STUDENT_LOGIN_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password = values['student_id'], values['password']
 
-        if not student_id or not password:
-            return jsonify({"error": "Missing student_id or password"}), 400 # Bad Request - Missing Parameter
-        
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", student_id) or re.search(r"[\'\";]", password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        # Valididate Data types
-        if not isinstance(student_id,str):
-            return jsonify({"error": "student_id should be a string"}), 400 # Bad Request - Invalid Data Types
-        if not isinstance(password,str):
-            return jsonify({"error": "password should be a string"}), 400 # Bad Request - Invalid Data Types
-        
         student_data, status_code = validate_student_credentials(student_id, password)
 
         if status_code != 200: # NOT OK
             return jsonify(student_data), status_code
         
-        cursor = conn.cursor()
         try:
-            cursor.execute("DELETE FROM STUDENT WHERE ID = %s", (student_id,))
-            conn.commit()
-            return jsonify({"message": "Student deleted successfully"}), 200 # OK
+            run_write_statements([("DELETE FROM STUDENT WHERE ID = %s", (student_id,))], shard=branch_shard(student_data.branch))
         except Exception as e:
-            return jsonify({"error": str(e)}), 500 # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
+
+        if shard_directory is not None:
+            shard_directory.remove('student', student_id)
+        return jsonify({"message": "Student deleted successfully"}), 200 # OK
         
     # Handle other methods for /student/remove
     else:
@@ -345,37 +745,26 @@ def delete_student():
 @app.route('/student/details', methods=['GET'])
 def display_student_details():
     if request.method == 'GET':
-        student_id = request.args.get('student_id')
-        password = request.args.get('password')
+        # Validate missing parameters, injection patterns and data types
+        values, error = STUDENT_LOGIN_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password = values['student_id'], values['password']
 
-        # if key and values aren't given
-        if not student_id or not password:
-            return jsonify({"error": "Missing student_id or password"}), 400 # Bad Request - Missing Parameter
-        
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", student_id) or re.search(r"[\'\";]", password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        # Valididate Data types
-        if not isinstance(student_id,str):
-            return jsonify({"error": "student_id should be a string"}), 400 # Bad Request - Invalid Data Types
-        if not isinstance(password,str):
-            return jsonify({"error": "password should be a string"}), 400 # Bad Request - Invalid Data Types
-        
         student_data, status_code = validate_student_credentials(student_id, password)
 
         if status_code != 200:
             return jsonify(student_data), status_code
         
         display = {
-            "Student ID":          html.escape(student_data[0]),
-            "Name":                html.escape(student_data[1]),
-            "Branch":              html.escape(student_data[6]),
-            "Admission Year":      html.escape(student_data[2]),
-            "Placed":              html.escape(student_data[3]),
-            "Semester-wise Marks": html.escape(student_data[4]),
-            "Percentage":          float(student_data[5]),
-            "Certified Skills":    html.escape(student_data[7]),
+            "Student ID":          html.escape(student_data.student_id),
+            "Name":                html.escape(student_data.name),
+            "Branch":              html.escape(student_data.branch),
+            "Admission Year":      html.escape(student_data.admission_year),
+            "Placed":              html.escape(student_data.placed),
+            "Semester-wise Marks": html.escape(student_data.semester_wise_marks),
+            "Percentage":          student_data.percentage,
+            "Certified Skills":    html.escape(student_data.certified_skills),
         }
         return jsonify(display), status_code
     
@@ -387,62 +776,50 @@ def display_student_details():
 @app.route('/student/eligibility', methods=['GET'])
 def student_eligibilty():
     if request.method == 'GET':
-        student_id = request.args.get('student_id')
-        password = request.args.get('password')
-
-        # Validate input
-        if not student_id or not password:
-            return jsonify({"error": "Missing student_id or password"}), 400  # Bad Request - Missing Parameter
+        # Validate missing parameters, injection patterns and data types
+        values, error = STUDENT_LOGIN_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password = values['student_id'], values['password']
 
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", student_id) or re.search(r"[\'\";]", password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        # Valididate Data types
-        if not isinstance(student_id,str):
-            return jsonify({"error": "student_id should be a string"}), 400 # Bad Request - Invalid Data Types
-        if not isinstance(password,str):
-            return jsonify({"error": "password should be a string"}), 400 # Bad Request - Invalid Data Types
-        
-
-        student_data, status_code = validate_student_credentials(student_id, password)
+        student_data, status_code = validate_student_credentials(student_id, password, allow_stale=True)
 
         if status_code != 200:
             return jsonify({"error": "Invalid student ID or password"}), status_code
+
+        throttled = charge_principal(student_session(student_id))
+        if throttled:
+            return throttled
         
-        if student_data[3] == "Yes":
+        if student_data.is_placed:
             return jsonify({"message": "You're Already Placed!"}),200
         
-        student_percentage = float(student_data[5])
+        student_percentage = student_data.percentage
         # get eligible companies based on student's percentage
-        eligible_companies = get_eligible_companies(student_percentage)
+        eligible_companies = get_eligible_companies(student_percentage, allow_stale=True)
 
         if not eligible_companies:
             return jsonify({"message": "No eligible companies found!"}), 404
         
+        # Student members are the same for every entry, so serialize them once
+        student_members = b",".join([
+            json_member("Student Branch", html.escape(student_data.branch)),
+            json_member("Student Percentage", student_percentage),
+            json_member("Student Skills", [html.escape(skill) for skill in student_data.skills]),
+        ])
+
         # print details of company in matched with additional data like likelihood and Matching Skills
+        # (cached company fragments plus the per-student members)
         eligible_companies_list = []
         for company in eligible_companies:
             likelihood = calculate_placement_likelihood(student_data= student_data, company= company)
-            matching_skills, student_skill_set, _ = get_matching_skills(student_data[7], company[4])
+            matching_skills, _, _ = get_matching_skills(student_data, company)
             common_skills = ", ".join(matching_skills) if matching_skills else "No matching skills found!"
-            
-            company_display = {
-                "Branch":                     html.escape(company[3]),
-                "Company ID":                 html.escape(company[5]),
-                "Company Name":               html.escape(company[0]),
-                "Brief Description":          html.escape(company[1]),
-                "Required Percentage":        float(company[2]),
-                "Required Skills":            html.escape(company[4]),
-                "Student Branch":             html.escape(student_data[6]),
-                "Student Skills":             [html.escape(skill) for skill in student_skill_set],
-                "Matching Skills":            html.escape(common_skills),
-                "Student Percentage":         student_percentage,
-                "Placement Likelihood":       likelihood
-            }
-            eligible_companies_list.append(company_display)
+            company_fragments = company_eligibility_fragments(company.company_id, company.name, company.brief_description,
+                                                              company.required_percentage, company.branch, company.required_skills)
+            eligible_companies_list.append(eligibility_entry_bytes(company_fragments, html.escape(common_skills), likelihood, student_members))
 
-        return jsonify(eligible_companies_list)
+        return json_bytes_response(b"[" + b",".join(eligible_companies_list) + b"]")
     
     # Handle other methods for /student/eligibility
     else:
@@ -452,21 +829,11 @@ def student_eligibilty():
 @app.route('/student/update_skills', methods=['PUT'])
 def update_student_skills():
     if request.method == 'PUT':
-        student_id = request.json.get('student_id')
-        password = request.json.get('password')
-        new_skills = request.json.get('new_skills')
-
-        # if key and values aren't given
-        if not student_id or not password or not new_skills:
-            return jsonify({"error": "Missing student_id, password, or new_skills"}), 400 # Bad Request - Missing Parameter
-        
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", student_id) or re.search(r"[\'\";]", password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        error = validate_data_types_update_skills(new_skills=new_skills,student_id=student_id,password=password)
+        # Validate missing parameters, injection patterns and data types
+        values, error = UPDATE_SKILLS_SCHEMA.validate(request.json)
         if error:
-            return jsonify({"error": error}), 400  # Bad Request - Invalid input
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password, new_skills = values['student_id'], values['password'], values['new_skills']
 
         student_data, status_code = validate_student_credentials(student_id, password)
 
@@ -476,22 +843,16 @@ def update_student_skills():
         # Sanitize input skills
         sanitized_skills = [html.escape(skill) for skill in new_skills]
 
-        if student_data[7] is None:
-            updated_skills = list(set(sanitized_skills))
-        else:
-            current_skills = student_data[7].split(',') if student_data[7] else []
-            current_skills.extend(sanitized_skills)
-            updated_skills = list(set(current_skills))  # Remove duplicates
+        current_skills = list(student_data.skills)
+        current_skills.extend(sanitized_skills)
+        updated_skills = list(set(current_skills))  # Remove duplicates
 
         # Update the student's skills in the database
         try:
-            cursor = conn.cursor()
-            cursor.execute("UPDATE STUDENT SET CERTIFIED_SKILLS = %s WHERE ID = %s", (', '.join(updated_skills), student_id))
-            conn.commit()
+            run_write_statements([("UPDATE STUDENT SET CERTIFIED_SKILLS = %s WHERE ID = %s", (', '.join(updated_skills), student_id))],
+                                 shard=branch_shard(student_data.branch))
         except Exception as e:
-            return jsonify({"error": str(e)}), 500 # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
 
         return jsonify({"message": f"Skills updated successfully of student ID {student_id}"}), 200 # OK
     
@@ -503,34 +864,19 @@ def update_student_skills():
 @app.route('/student/apply', methods=['POST'])
 def apply_to_company():
     if request.method == 'POST':
-        student_id = request.json.get('student_id')
-        password = request.json.get('password')
-        company_id = request.json.get('company_id')
-
-        # if key and values aren't given
-        if not student_id or not password or not company_id:
-            return jsonify({"error": "Missing student_id, password, or company_id"}), 400  # Bad Request - Missing Parameter
-
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", student_id) or re.search(r"[\'\";]", password) or re.search(r"[\'\";]", company_id):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        # Validate data types
-        error = validate_data_types_apply_std_apply(student_id=student_id, password=password, company_id=company_id)
+        # Validate missing parameters, injection patterns and data types
+        values, error = APPLY_SCHEMA.validate(request.json)
         if error:
-            return jsonify({"error": error}), 400  # Bad Request - Invalid input
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password, company_id = values['student_id'], values['password'], values['company_id']
 
         # Validate student credentials
         student_data, status_code = validate_student_credentials(student_id, password)
         if status_code != 200:
             return jsonify(student_data), status_code
 
-        # storing into variables
-        student_place_status = student_data[3]
-        student_percentage = float(student_data[5])
-
         # Check if the student is already placed
-        if student_place_status == "Yes":
+        if student_data.is_placed:
             return jsonify({"message": "You're Already Placed!"}), 200
 
         # Get company data
@@ -538,40 +884,36 @@ def apply_to_company():
         if not company_data:
             return jsonify({"error": f"Company ID {company_id} doesn't exist"}), 404  # Not Found
         
-        company_required_percentage = float(company_data[2])
         # Check if the student is eligible for the company
-        if student_percentage < company_required_percentage:
+        if student_data.percentage < company_data.required_percentage:
             return jsonify({"error": "Student does not meet the required percentage for this company"}), 403  # Forbidden
 
         # Check matching skills
-        matching_skills, _, _ = get_matching_skills(student_data[7], company_data[4])
+        matching_skills, _, _ = get_matching_skills(student_data, company_data)
         if not matching_skills:
             return jsonify({"error": "Student does not have the required skills for this company"}), 403  # Forbidden
 
         # Check if the student has already applied to this company
         try:
-            cursor = conn.cursor()
-            cursor.execute(
+            existing_application = run_read_query(
                 "SELECT 1 FROM APPLICATION WHERE STUDENT_ID = %s AND COMPANY_ID = %s",
-                (student_id, company_id)
+                (student_id, company_id), shard=branch_shard(student_data.branch)
             )
-            existing_application = cursor.fetchone()
             if existing_application:
                 return jsonify({"error": "You have already applied to this company"}), 409  # Conflict
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
+            return database_error_response(e)
 
         # Insert application record into the APPLICATION table
         try:
-            cursor.execute(
+            run_write_statements([(
                 "INSERT INTO APPLICATION (STUDENT_ID, COMPANY_ID) VALUES (%s, %s)",
                 (student_id, company_id)
-            )
-            conn.commit()
+            )], shard=branch_shard(student_data.branch))  # applications live on the student's shard
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
+
+        notification_broker.publish(company_topic(company_id), "new_application", {"student_id": student_id, "company_id": company_id})
 
         return jsonify({"message": "Application submitted successfully"}), 201  # Created
     
@@ -583,16 +925,11 @@ def apply_to_company():
 @app.route('/student/display/applications', methods=['POST'])
 def get_student_applications():
     if request.method == 'POST':
-        student_id = request.json.get('student_id')
-        password = request.json.get('password')
-
-        # Check if key and values aren't given
-        if not student_id or not password:
-            return jsonify({"error": "Missing student_id or password"}), 400  # Bad Request - Missing Parameter
-
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", student_id) or re.search(r"[\'\";]", password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
+        # Validate missing parameters, injection patterns and data types
+        values, error = STUDENT_LOGIN_SCHEMA.validate(request.json)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password = values['student_id'], values['password']
 
         # Validate student credentials
         student_data, status_code = validate_student_credentials(student_id, password)
@@ -601,34 +938,20 @@ def get_student_applications():
 
         # Fetch applications
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT
-                    APPLICATION.APPLICATION_ID,
-                    COMPANY.COMPANY_NAME,
-                    APPLICATION.STATUS
-                FROM
-                    APPLICATION
-                JOIN COMPANY ON APPLICATION.COMPANY_ID = COMPANY.ID
-                WHERE
-                    APPLICATION.STUDENT_ID = %s
-            """, (student_id,))
-            applications = cursor.fetchall()
+            applications = get_applications_of_student(student_data)
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
 
         if not applications:
             return jsonify({"message": "No applications found"}), 404  # Not Found
 
         applications_list = [
             {
-                "application_id": app[0],
-                "company_name": app[1],
-                "status": app[2]
+                "application_id": application.application_id,
+                "company_name": application.company_name,
+                "status": application.status
             }
-            for app in applications
+            for application in applications
         ]
 
         return jsonify({"applications": applications_list}), 200  # OK
@@ -639,31 +962,25 @@ def get_student_applications():
 # Route function to add a new company ---> /company/add
 @app.route('/company/add', methods=['POST'])
 def add_company():
-    cursor = conn.cursor()
     if request.method == 'POST':
-        company_id = request.json.get('company_id')
-        name = request.json.get('name')
-        brief_description = request.json.get('brief_description')
-        required_percentage = request.json.get('required_percentage')
-        branch = request.json.get('branch')
-        required_skills = request.json.get('required_skills')
-        
-        # Remove duplicates from required_skills
-        required_skills_list = list(set(required_skills.split(',')))
-        required_skills = ','.join(required_skills_list)
+        # Validate missing details, data types and injection patterns
+        company_data, error = COMPANY_ADD_SCHEMA.validate(request.json)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid Data Types
 
-        # if key and values aren't given
-        if not company_id or not name or not brief_description or not required_percentage or not branch or not required_skills:
-            return jsonify({"error": "Missing required company details"}), 400  # Bad Request - Missing Parameter
+        company_id = company_data['company_id']
+        name = company_data['name']
+        brief_description = company_data['brief_description']
+        required_percentage = company_data['required_percentage']
+        branch = company_data['branch']
 
-        # Validate data types
-        error = validate_data_types_for_company(request.json)
-        if error:
-            return jsonify({"error": error}), 400  # Bad Request - Invalid Data Types
+        # Remove duplicates from required_skills
+        required_skills_list = list(set(company_data['required_skills'].split(',')))
+        required_skills = ','.join(required_skills_list)
 
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", company_id) or re.search(r"[\'\";]", name) or re.search(r"[\'\";]", brief_description) or re.search(r"[\'\";]", branch) or re.search(r"[\'\";]", required_skills):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
+        # Sharded, the branch decides which database holds the company
+        if shard_router is not None and branch not in VALID_BRANCHES:
+            return jsonify({"error": f"branch should be one of {VALID_BRANCHES}"}), 400  # Bad Request - Invalid input
 
         try:
             # Check if company ID already exists
@@ -671,15 +988,29 @@ def add_company():
             if existing_company:
                 return jsonify({"error": "Company ID already exists"}), 409  # Conflict - ID already exists
 
-            cursor.execute(
+            run_write_statements([(
                 "INSERT INTO COMPANY (COMPANY_NAME, BRIEF_DESCRIPTION, REQUIRED_PERCENTAGE, BRANCH, REQUIRED_SKILLS, ID) VALUES (%s, %s, %s, %s, %s, %s)",
                 (name, brief_description, required_percentage, branch, required_skills, company_id)
-            )
-            conn.commit()
+            )], shard=branch_shard(branch))
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
+
+        if shard_directory is not None:
+            shard_directory.register('company', company_id, branch)
+
+        # Keep the search index in step with the catalog
+        new_company = Company(name, brief_description, required_percentage, branch, required_skills, company_id)
+        if company_index.built:
+            company_index.add(new_company)
+
+        # Push the new company to connected students who meet its percentage
+        notification_broker.publish(CATALOG_TOPIC, "company_added", {
+            "Company ID":          html.escape(new_company.company_id),
+            "Company Name":        html.escape(new_company.name),
+            "Branch":              html.escape(new_company.branch),
+            "Required Percentage": new_company.required_percentage,
+            "Required Skills":     html.escape(new_company.required_skills),
+        })
 
         return jsonify({"message": "Company added successfully"}), 201  # Created
 
@@ -691,32 +1022,23 @@ def add_company():
 @app.route('/company/details',methods=['GET'])
 def display_company_details():
     if request.method == 'GET':
-        company_id = request.args.get('company_id')
-        company_password = request.args.get('company_password')
-        
-        # if key and values aren't given
-        if not company_id or not company_password:
-            return jsonify({"error": "Missing company_id or company_password"}), 400 # Bad Request - Missing Parameter
-        
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", company_id) or re.search(r"[\'\";]", company_password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        # Validate data types
-        if not isinstance(company_id, str) or not isinstance(company_password, str):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
+        # Validate missing parameters, injection patterns and data types
+        values, error = COMPANY_LOGIN_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        company_id, company_password = values['company_id'], values['company_password']
 
-        company_data, status_code = validate_company_credentials(company_id, company_password)
+        company_data, status_code = validate_company_credentials(company_id, company_password, allow_stale=True)
 
         if status_code != 200: 
             return jsonify(company_data),status_code
         display_specific_company_details = {
-            "Company ID":          html.escape(company_data[5]),
-            "Branch":              html.escape(company_data[3]),
-            "Name":                html.escape(company_data[0]),
-            "Brief Description":   html.escape(company_data[1]),
-            "Required Percentage": float(company_data[2]),
-            "Required Skills":     [html.escape(company_data[4])],
+            "Company ID":          html.escape(company_data.company_id),
+            "Branch":              html.escape(company_data.branch),
+            "Name":                html.escape(company_data.name),
+            "Brief Description":   html.escape(company_data.brief_description),
+            "Required Percentage": company_data.required_percentage,
+            "Required Skills":     [html.escape(company_data.required_skills)],
         }
         return jsonify(display_specific_company_details), status_code
     
@@ -728,21 +1050,11 @@ def display_company_details():
 @app.route('/company/delete', methods=['DELETE'])
 def delete_company():
     if request.method == 'DELETE':
-        company_id = request.json.get('company_id')
-        company_password = request.json.get('company_password')
-
-        # Check if key and values aren't given
-        if not company_id or not company_password:
-            return jsonify({"error": "Missing company_id or company_password"}), 400  # Bad Request - Missing Parameter
-        
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", company_id) or re.search(r"[\'\";]", company_password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-
-        # Validate data types
-        if not isinstance(company_id, str) or not isinstance(company_password, str):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
+        # Validate missing parameters, injection patterns and data types
+        values, error = COMPANY_LOGIN_SCHEMA.validate(request.json)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        company_id, company_password = values['company_id'], values['company_password']
 
         company_data, status_code = validate_company_credentials(company_id, company_password)
 
@@ -751,13 +1063,13 @@ def delete_company():
 
         # Delete the company from the database
         try:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM COMPANY WHERE ID = %s", (company_id,))
-            conn.commit()
+            run_write_statements([("DELETE FROM COMPANY WHERE ID = %s", (company_id,))], shard=branch_shard(company_data.branch))
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
+
+        if shard_directory is not None:
+            shard_directory.remove('company', company_id)
+        company_index.remove(company_id)
 
         return jsonify({"message": "Company deleted successfully"}), 200  # OK
     
@@ -769,54 +1081,49 @@ def delete_company():
 @app.route('/company/applications', methods=['GET'])
 def display_company_applications():
     if request.method == 'GET':
-        cursor = conn.cursor()
-        company_id = request.args.get('company_id')
-        company_password = request.args.get('company_password')
-
-        # if key and values aren't given
-        if not company_id or not company_password:
-            return jsonify({"error": "Missing company_id or company_password"}), 400 # Bad Request - Missing Parameter
-        
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", company_id) or re.search(r"[\'\";]", company_password):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-        
-        # Validate data types
-        if not isinstance(company_id, str) or not isinstance(company_password, str):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
+        # Validate missing parameters, injection patterns and data types
+        values, error = COMPANY_LOGIN_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        company_id, company_password = values['company_id'], values['company_password']
 
         company_data, status_code = validate_company_credentials(company_id, company_password)
         if status_code != 200:
             return jsonify(company_data), status_code
 
+        throttled = charge_principal(company_session(company_id))
+        if throttled:
+            return throttled
+
         # Fetch applications for the company
         try:
-            cursor.execute("SELECT APPLICATION_ID, STUDENT_ID FROM APPLICATION WHERE COMPANY_ID = %s", (company_id,))
-            applications = cursor.fetchall()
+            rows = run_read_query_all_shards("SELECT APPLICATION_ID, STUDENT_ID, COMPANY_ID, STATUS FROM APPLICATION WHERE COMPANY_ID = %s", (company_id,))
+            applications = applications_from_rows(rows)
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
 
         if not applications:
             return jsonify({"message": "No applications found for this company"}), 404
 
+        # Company members are the same for every application
+        escaped_company_id = html.escape(company_id)
+        escaped_required_skills = [html.escape(req_skill) for req_skill in company_data.skills]
+
         applications_list = []
         for application in applications:
-            student_id = application[1]
-            student_data = get_student_data_from_snowflake(student_id=student_id)
-            matching_skills, student_skills, company_required_skills = get_matching_skills(student_data[7], company_data[4])
+            student_data = get_student_data_from_snowflake(student_id=application.student_id)
+            matching_skills, _, _ = get_matching_skills(student_data, company_data)
             application_display = {
-                "Application ID":           int(application[0]),
-                "Compamy ID" :              html.escape(company_id),
-                "Student ID":               html.escape(application[1]),
-                "Student Name":             html.escape(student_data[1]),
-                "Branch":                   html.escape(student_data[6]),
-                "Percentage":               float(student_data[5]),
-                "Certified Skills":         html.escape(student_data[7]),
-                "Required Skills":          [html.escape(req_skill) for req_skill in company_required_skills],
+                "Application ID":           application.application_id,
+                "Compamy ID" :              escaped_company_id,
+                "Student ID":               html.escape(application.student_id),
+                "Student Name":             html.escape(student_data.name),
+                "Branch":                   html.escape(student_data.branch),
+                "Percentage":               student_data.percentage,
+                "Certified Skills":         html.escape(student_data.certified_skills),
+                "Required Skills":          escaped_required_skills,
                 "Matched Skills":           [html.escape(skill) for skill in matching_skills],
-                "Admission Year" :          html.escape(student_data [2])
+                "Admission Year" :          html.escape(student_data.admission_year)
             }
             applications_list.append(application_display)
 
@@ -830,24 +1137,15 @@ def display_company_applications():
 @app.route('/company/application/update', methods=['PUT'])
 def update_application_status():
     if request.method == 'PUT':
-        application_update_data = request.json
-        application_id = application_update_data.get('application_id')
-        company_id = application_update_data.get('company_id')
-        company_password = application_update_data.get('company_password')
-        status = application_update_data.get('status')
-
-        # Check if key and values aren't given
-        if not application_id or not company_id or not company_password or not status:
-            return jsonify({"error": "Missing application_id, company_id, company_password, or status"}), 400  # Bad Request - Missing Parameter
-
-        # Check for SQL injection patterns (simple heuristic check)
-        if re.search(r"[\'\";]", application_id) or re.search(r"[\'\";]", company_id) or re.search(r"[\'\";]", company_password) or re.search(r"[\'\";]", status):
-            return jsonify({"error": "Invalid input"}), 400  # Bad Request - Invalid input
-
-        # Validate data types
-        error = validate_update_applications(application_update_data)
+        # Validate missing parameters, injection patterns, data types and status
+        application_update_data, error = APPLICATION_UPDATE_SCHEMA.validate(request.json)
         if error:
-            return jsonify({"error": error}), 400  # Bad Request - Invalid input
+            return jsonify(error), 400  # Bad Request - Invalid input
+
+        application_id = application_update_data['application_id']
+        company_id = application_update_data['company_id']
+        company_password = application_update_data['company_password']
+        status = application_update_data['status']
 
         sanitized_status = html.escape(status)
 
@@ -855,17 +1153,18 @@ def update_application_status():
         if status_code != 200:
             return jsonify(company_data), status_code
 
+        # Application ids tell which shard holds them (the student's shard, so both updates stay in one database)
+        found, shard = locate_application_shard(application_id)
+        if not found:
+            return jsonify({"error": "Application not found"}), 404  # Not Found
+
         # Fetch application details
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT STUDENT_ID FROM APPLICATION WHERE APPLICATION_ID = %s AND COMPANY_ID = %s", (application_id, company_id)
+            application = run_read_query(
+                "SELECT STUDENT_ID FROM APPLICATION WHERE APPLICATION_ID = %s AND COMPANY_ID = %s", (application_id, company_id), shard=shard
             )
-            application = cursor.fetchone()
         except Exception as e:
-            return jsonify({"error": str(e)}), 500  # Internal Server Error
-        finally:
-            cursor.close()
+            return database_error_response(e)
 
         if not application:
             return jsonify({"error": "Application not found"}), 404  # Not Found
@@ -875,37 +1174,27 @@ def update_application_status():
         # If status is 'accept', update the student's 'PLACED' column and the application status
         if sanitized_status.lower() == 'accept':
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE STUDENT SET PLACED = 'Yes' WHERE ID = %s", (student_id,)
-                )
-                cursor.execute(
-                    "UPDATE APPLICATION SET STATUS = 'Accept' WHERE APPLICATION_ID = %s", (application_id,)
-                )
-                conn.commit()
+                run_write_statements([
+                    ("UPDATE STUDENT SET PLACED = 'Yes' WHERE ID = %s", (student_id,)),
+                    ("UPDATE APPLICATION SET STATUS = 'Accept' WHERE APPLICATION_ID = %s", (application_id,)),
+                ], affects=[student_session(student_id)], shard=shard)
             except Exception as e:
-                return jsonify({"error": str(e)}), 500  # Internal Server Error
-            finally:
-                cursor.close()
-            
+                return database_error_response(e)
+
+            publish_application_status(student_id, company_id, application_id, 'Accept')
             return jsonify({"message": "Application accepted and student status updated to 'Placed'"}), 200  # OK
         
         # If status is 'reject', update the application status
         else:
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE APPLICATION SET STATUS = 'Rejected' WHERE APPLICATION_ID = %s", (application_id,)
-                )
-                cursor.execute(
-                    "UPDATE STUDENT SET PLACED = 'No' WHERE ID = %s", (student_id,)
-                )
-                conn.commit()
+                run_write_statements([
+                    ("UPDATE APPLICATION SET STATUS = 'Rejected' WHERE APPLICATION_ID = %s", (application_id,)),
+                    ("UPDATE STUDENT SET PLACED = 'No' WHERE ID = %s", (student_id,)),
+                ], affects=[student_session(student_id)], shard=shard)
             except Exception as e:
-                return jsonify({"error": str(e)}), 500  # Internal Server Error
-            finally:
-                cursor.close()
-            
+                return database_error_response(e)
+
+            publish_application_status(student_id, company_id, application_id, 'Rejected')
             return jsonify({"message": "Application rejected"}), 200  # OK
     
     # Handle other methods for /company/application/update
@@ -913,11 +1202,457 @@ def update_application_status():
         return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
 
 
+# Route to search companies by name, description and required skills --->                     /company/search
+@app.route('/company/search', methods=['GET'])
+def search_companies():
+    if request.method == 'GET':
+        # Validate the query and limit
+        values, error = COMPANY_SEARCH_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        query, limit = values['q'], values['limit']
+
+        try:
+            companies = get_company_index().search(query, limit=min(int(limit), 100))
+        except Exception as e:
+            return database_error_response(e)
+
+        if not companies:
+            return jsonify({"message": "No matching companies found"}), 404  # Not Found
+
+        results = [
+            {
+                "Company ID":          html.escape(company.company_id),
+                "Name":                html.escape(company.name),
+                "Branch":              html.escape(company.branch),
+                "Brief Description":   html.escape(company.brief_description),
+                "Required Percentage": company.required_percentage,
+                "Required Skills":     html.escape(company.required_skills),
+            }
+            for company in companies
+        ]
+        return jsonify(results), 200  # OK
+
+    # Handle other methods for /company/search
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+# Route to suggest skills from the company catalog --->                                      /skills/autocomplete
+@app.route('/skills/autocomplete', methods=['GET'])
+def autocomplete_skills():
+    if request.method == 'GET':
+        # Validate the prefix and limit
+        values, error = SKILL_AUTOCOMPLETE_SCHEMA.validate(request.args)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        prefix, limit = values['prefix'], values['limit']
+
+        try:
+            skills = get_company_index().autocomplete_skills(prefix, limit=min(int(limit), 50))
+        except Exception as e:
+            return database_error_response(e)
+
+        return jsonify({"skills": [html.escape(skill) for skill in skills]}), 200  # OK
+
+    # Handle other methods for /skills/autocomplete
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+# Function to store drive placements as accepted applications and placed students in one transaction
+def write_placements(placements, existing_applications, shard=None):
+    new_applications = [(student_id, company_id) for student_id, company_id, _ in placements if (student_id, company_id) not in existing_applications]
+    accepted_applications = [(student_id, company_id) for student_id, company_id, _ in placements if (student_id, company_id) in existing_applications]
+    run_bulk_write_statements([
+        ("INSERT INTO APPLICATION (STUDENT_ID, COMPANY_ID, STATUS) VALUES (%s, %s, 'Accept')", new_applications),
+        ("UPDATE APPLICATION SET STATUS = 'Accept' WHERE STUDENT_ID = %s AND COMPANY_ID = %s AND STATUS <> 'Rejected'", accepted_applications),
+        ("UPDATE STUDENT SET PLACED = 'Yes' WHERE ID = %s", [(student_id,) for student_id, _, _ in placements]),
+    ], affects=[student_session(student_id) for student_id, _, _ in placements]
+       + [company_session(company_id) for _, company_id, _ in placements], shard=shard)
+
+# Route to run a batch placement drive over all unplaced students --->                        /placement/drive
+@app.route('/placement/drive', methods=['POST'])
+def run_drive():
+    if request.method == 'POST':
+        # Validate the password, seats and options
+        drive_data, error = PLACEMENT_DRIVE_SCHEMA.validate(request.json)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        password = drive_data['password']
+
+        if password != PLACEMENT_OFFICE_PASSWORD:
+            return jsonify({"error": "Password doesn't match"}), 401  # Unauthorized - Invalid Authentication Creds
+
+        throttled = charge_principal(PLACEMENT_OFFICE_PRINCIPAL)
+        if throttled:
+            return throttled
+
+        dry_run = drive_data['dry_run']  # Default to a simulation
+
+        # Load the whole population once
+        try:
+            students = students_from_rows(run_read_query_all_shards("SELECT * FROM STUDENT WHERE PLACED = 'No'"))
+            companies = get_company_data_from_snowflake()
+            applications = run_read_query_all_shards("SELECT STUDENT_ID, COMPANY_ID, STATUS FROM APPLICATION")
+        except Exception as e:
+            return database_error_response(e)
+
+        # A company's rejection stands: those pairs are left out of the matching
+        existing_applications = {(student_id, company_id) for student_id, company_id, _ in applications}
+        rejected_applications = {(student_id, company_id) for student_id, company_id, status in applications if status == 'Rejected'}
+
+        placements, stats = run_placement_drive(students, companies, capacities=drive_data['seats'],
+                                                default_seats=drive_data['default_seats'], excluded_pairs=rejected_applications)
+
+        # Write every proposed placement back in a single transaction (one per shard when sharded)
+        if not dry_run and placements:
+            student_branches = {student.student_id: student.branch for student in students}
+            placements_by_shard = {}
+            for placement in placements:
+                placements_by_shard.setdefault(branch_shard(student_branches[placement[0]]), []).append(placement)
+            try:
+                for shard, shard_placements in placements_by_shard.items():
+                    write_placements(shard_placements, existing_applications, shard=shard)
+            except Exception as e:
+                return database_error_response(e)
+
+            for student_id, company_id, _ in placements:
+                publish_application_status(student_id, company_id, None, 'Accept')
+
+        placements_list = [
+            {
+                "Student ID":           html.escape(student_id),
+                "Company ID":           html.escape(company_id),
+                "Placement Likelihood": likelihood
+            }
+            for student_id, company_id, likelihood in placements
+        ]
+        return jsonify({"dry_run": dry_run, "placements": placements_list, "stats": stats}), 200 if dry_run else 201
+
+    # Handle other methods for /placement/drive
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+# Marks are written with an optimistic guard: the row must still hold the MARKS_SUM and MARKS_COUNT that were read,
+# with -1 standing for a count that was never stored (NULL). A guard that matches nothing means another update won.
+MARKS_UPDATE_STATEMENT = ("UPDATE STUDENT SET SEM_WISE = %s, MARKS_SUM = %s, MARKS_COUNT = %s, PERCENTAGE = %s "
+                          "WHERE ID = %s AND COALESCE(MARKS_SUM, 0) = %s AND COALESCE(MARKS_COUNT, -1) = %s")
+MARKS_CONFLICT_MESSAGE = "Marks were changed by another update, please retry"
+MARKS_BATCH_ROWS = 1000     # students per UPDATE statement (7 parameters each)
+
+# Function to build one set-based UPDATE for a chunk of students.
+# VALUES columns are named COLUMN1..COLUMN7 by both Snowflake and SQLite: id, the four new values, then the guard.
+def branch_marks_statement(students):
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * students)
+    return ("UPDATE STUDENT SET SEM_WISE = NEW_MARKS.COLUMN2, MARKS_SUM = NEW_MARKS.COLUMN3, MARKS_COUNT = NEW_MARKS.COLUMN4, "
+            f"PERCENTAGE = NEW_MARKS.COLUMN5 FROM (VALUES {values}) AS NEW_MARKS "
+            "WHERE STUDENT.ID = NEW_MARKS.COLUMN1 AND COALESCE(STUDENT.MARKS_SUM, 0) = NEW_MARKS.COLUMN6 "
+            "AND COALESCE(STUDENT.MARKS_COUNT, -1) = NEW_MARKS.COLUMN7")
+
+# Function to get the guard values for a student as read
+def marks_guard(student):
+    if student.marks_count is None:
+        return 0, -1
+    return student.marks_sum, student.marks_count
+
+# Function to apply one semester's marks to a student record; returns the updated record
+def student_with_marks(student, semester, semester_marks):
+    semester_wise_marks, marks_sum, marks_count, percentage = student.with_semester_marks(semester, semester_marks)
+    return Student(student.student_id, student.name, student.admission_year, student.placed, semester_wise_marks,
+                   percentage, student.branch, student.certified_skills, marks_sum, marks_count)
+
+# Route to append or correct one student's semester marks --->                                /student/marks
+@app.route('/student/marks', methods=['PUT'])
+def update_student_marks():
+    if request.method == 'PUT':
+        # Validate missing parameters, injection patterns, data types and marks range
+        marks_data, error = MARKS_UPDATE_SCHEMA.validate(request.json)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        student_id, password = marks_data['student_id'], marks_data['password']
+
+        if password != PLACEMENT_OFFICE_PASSWORD:
+            return jsonify({"error": "Password doesn't match"}), 401  # Unauthorized - Invalid Authentication Creds
+
+        try:
+            # The guard compares against what was read, so read the primary rather than a lagging replica
+            student_data = get_student_data_from_snowflake(student_id, use_replica=False)
+        except Exception as e:
+            return database_error_response(e)
+        if not student_data:
+            return jsonify({"error": f"Student ID {student_id} doesn't exist"}), 404  # Not Found
+
+        # Without a semester the marks are appended as the next one
+        semester = marks_data.get('semester') or student_data.marks_totals()[1] + 1
+        try:
+            updated_student = student_with_marks(student_data, semester, marks_data['semester_marks'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400  # Bad Request - semester out of range
+
+        shard = branch_shard(student_data.branch)
+        try:
+            updated_rows = run_write_statements([(MARKS_UPDATE_STATEMENT, (
+                updated_student.semester_wise_marks, updated_student.marks_sum, updated_student.marks_count,
+                updated_student.percentage, student_id, *marks_guard(student_data)))], shard=shard)
+        except Exception as e:
+            return database_error_response(e)
+        if not updated_rows:
+            return jsonify({"error": MARKS_CONFLICT_MESSAGE}), 409  # Conflict - marks changed since they were read
+        refresh_student_dependents(updated_student, shard)
+
+        return jsonify({
+            "message":             f"Marks updated successfully of student ID {student_id}",
+            "Semester":            semester,
+            "Semester-wise Marks": updated_student.semester_wise_marks,
+            "Percentage":          updated_student.percentage
+        }), 200  # OK
+
+    # Handle other methods for /student/marks
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+# Route to apply a whole semester's results for one branch in a single transaction --->       /student/marks/batch
+@app.route('/student/marks/batch', methods=['POST'])
+def apply_branch_marks():
+    if request.method == 'POST':
+        # Validate missing parameters, data types and marks range
+        marks_data, error = BRANCH_MARKS_SCHEMA.validate(request.json)
+        if error:
+            return jsonify(error), 400  # Bad Request - Invalid input
+        password = marks_data['password']
+
+        if password != PLACEMENT_OFFICE_PASSWORD:
+            return jsonify({"error": "Password doesn't match"}), 401  # Unauthorized - Invalid Authentication Creds
+
+        throttled = charge_principal(PLACEMENT_OFFICE_PRINCIPAL)
+        if throttled:
+            return throttled
+
+        branch, semester, results = marks_data['branch'], marks_data['semester'], marks_data['results']
+        shard = branch_shard(branch)
+
+        # The whole branch lives on one shard, so one primary read and one transaction cover it
+        try:
+            students = {student.student_id: student for student in students_from_rows(
+                run_read_query("SELECT * FROM STUDENT WHERE BRANCH = %s", (branch,), fetch='all', shard=shard, use_replica=False))}
+        except Exception as e:
+            return database_error_response(e)
+
+        unknown_students = sorted(student_id for student_id in results if student_id not in students)
+        if unknown_students:
+            return jsonify({"error": f"Students not found in branch {branch}", "student_ids": [html.escape(student_id) for student_id in unknown_students]}), 404  # Not Found
+
+        # All or nothing: any student for whom the semester is out of range rejects the batch
+        updated_students = []
+        invalid_students = []
+        for student_id, semester_marks in results.items():
+            try:
+                updated_students.append(student_with_marks(students[student_id], semester, semester_marks))
+            except ValueError:
+                invalid_students.append(student_id)
+        if invalid_students:
+            return jsonify({"error": f"Semester {semester} can't be applied to these students", "student_ids": [html.escape(student_id) for student_id in sorted(invalid_students)]}), 400  # Bad Request
+
+        # One set-based UPDATE per chunk, in one transaction on a pooled connection of this request's own;
+        # if any guard misses, the whole transaction is rolled back
+        batches = []
+        for start in range(0, len(updated_students), MARKS_BATCH_ROWS):
+            chunk = updated_students[start:start + MARKS_BATCH_ROWS]
+            params = []
+            for student in chunk:
+                params += [student.student_id, student.semester_wise_marks, student.marks_sum, student.marks_count,
+                           student.percentage, *marks_guard(students[student.student_id])]
+            batches.append((branch_marks_statement(len(chunk)), [params]))
+        try:
+            run_bulk_write_statements(batches, affects=[student_session(student.student_id) for student in updated_students],
+                                      shard=shard, expected_rows=len(updated_students))
+        except WriteConflictError:
+            return jsonify({"error": MARKS_CONFLICT_MESSAGE}), 409  # Conflict - marks changed since they were read
+        except Exception as e:
+            return database_error_response(e)
+        for student in updated_students:
+            refresh_student_dependents(student, shard)
+
+        return jsonify({"message": f"Semester {semester} marks applied for branch {branch}", "updated": len(updated_students)}), 200  # OK
+
+    # Handle other methods for /student/marks/batch
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+APPLICATIONS_REPORT_HEADER = [
+    "Application ID", "Status", "Student ID", "Student Name", "Student Branch", "Admission Year", "Percentage", "Placed",
+    "Certified Skills", "Company ID", "Company Name", "Company Branch", "Required Percentage", "Required Skills",
+]
+
+PLACED_STUDENTS_REPORT_HEADER = [
+    "Branch", "Admission Year", "Student ID", "Student Name", "Percentage", "Certified Skills", "Company ID", "Company Name",
+]
+
+# Function to check the placement office password and report filters; returns (values, None) or (None, response)
+def authorize_report():
+    values, error = REPORT_SCHEMA.validate(request.args)
+    if error:
+        return None, (jsonify(error), 400)  # Bad Request - Invalid input
+    if values['password'] != PLACEMENT_OFFICE_PASSWORD:
+        return None, (jsonify({"error": "Password doesn't match"}), 401)  # Unauthorized - Invalid Authentication Creds
+    throttled = charge_principal(PLACEMENT_OFFICE_PRINCIPAL)
+    if throttled:
+        return None, throttled
+    return values, None
+
+# Clients that send Accept-Encoding: gzip get a gzip-encoded stream
+def accepts_gzip():
+    return request.accept_encodings['gzip'] > 0
+
+# Function to yield application report rows; companies are joined from the (small) catalog in memory,
+# since sharded they may live on another shard than the application
+def application_report_batches(companies):
+    query = """
+        SELECT
+            APPLICATION.APPLICATION_ID, APPLICATION.STATUS,
+            STUDENT.ID, STUDENT.NAME, STUDENT.BRANCH, STUDENT.ADMYEAR, STUDENT.PERCENTAGE, STUDENT.PLACED, STUDENT.CERTIFIED_SKILLS,
+            APPLICATION.COMPANY_ID
+        FROM
+            APPLICATION
+        JOIN STUDENT ON APPLICATION.STUDENT_ID = STUDENT.ID
+        ORDER BY
+            APPLICATION.APPLICATION_ID
+    """
+    for shard in report_shards():
+        for rows in stream_read_query(query, shard=shard):
+            batch = []
+            for row in rows:
+                company = companies.get(row[9])
+                if company is not None:  # same as an inner join: skip applications to deleted companies
+                    batch.append(row[:9] + (company.company_id, company.name, company.branch, company.required_percentage, company.required_skills))
+            yield batch
+
+# Function to yield placed students ordered by branch and admission year, with the accepted company
+# (one row per student: when several applications were accepted, the lowest company ID is reported)
+def placed_student_report_batches(companies, branch=None, admission_year=None):
+    conditions, params = ["STUDENT.PLACED = 'Yes'"], []
+    if branch:
+        conditions.append("STUDENT.BRANCH = %s")
+        params.append(branch)
+    if admission_year:
+        conditions.append("STUDENT.ADMYEAR = %s")
+        params.append(admission_year)
+    query = f"""
+        SELECT
+            STUDENT.BRANCH, STUDENT.ADMYEAR, STUDENT.ID, STUDENT.NAME, STUDENT.PERCENTAGE, STUDENT.CERTIFIED_SKILLS,
+            APPLICATION.COMPANY_ID
+        FROM
+            STUDENT
+        LEFT JOIN (
+            SELECT STUDENT_ID, MIN(COMPANY_ID) AS COMPANY_ID FROM APPLICATION WHERE STATUS = 'Accept' GROUP BY STUDENT_ID
+        ) APPLICATION ON APPLICATION.STUDENT_ID = STUDENT.ID
+        WHERE
+            {" AND ".join(conditions)}
+        ORDER BY
+            STUDENT.BRANCH, STUDENT.ADMYEAR, STUDENT.ID
+    """
+    for shard in report_shards(branch):
+        for rows in stream_read_query(query, tuple(params), shard=shard):
+            batch = []
+            for row in rows:
+                company = companies.get(row[6])
+                batch.append(row[:7] + (company.name if company is not None else None,))
+            yield batch
+
+# Route to export every application with student and company details --->                    /reports/applications.csv
+@app.route('/reports/applications.csv', methods=['GET'])
+def export_applications_report():
+    if request.method == 'GET':
+        _, error_response = authorize_report()
+        if error_response:
+            return error_response
+
+        # Loaded before the stream starts, so an unavailable database still answers with a proper error
+        try:
+            companies = {company.company_id: company for company in get_company_data_from_snowflake()}
+        except Exception as e:
+            return database_error_response(e)
+
+        return csv_response("applications.csv", APPLICATIONS_REPORT_HEADER, application_report_batches(companies), compress=accepts_gzip())
+
+    # Handle other methods for /reports/applications.csv
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+# Route to export placed students per branch and admission year --->                         /reports/placed_students.csv
+@app.route('/reports/placed_students.csv', methods=['GET'])
+def export_placed_students_report():
+    if request.method == 'GET':
+        filters, error_response = authorize_report()
+        if error_response:
+            return error_response
+
+        try:
+            companies = {company.company_id: company for company in get_company_data_from_snowflake()}
+        except Exception as e:
+            return database_error_response(e)
+
+        row_batches = placed_student_report_batches(companies, branch=filters['branch'], admission_year=filters['admission_year'])
+        return csv_response("placed_students.csv", PLACED_STUDENTS_REPORT_HEADER, row_batches, compress=accepts_gzip())
+
+    # Handle other methods for /reports/placed_students.csv
+    else:
+        return jsonify({"error": "Method Not Allowed"}), 405  # Method Not Allowed
+
+# Route to expose limiter and breaker state --->                                               /metrics
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    breakers = {"primary": breaker.state}
+    breakers.update({"read_replica" if shard is None else f"read_replica_{shard}": read_breaker.state for shard, read_breaker in read_breakers.items()})
+    breakers.update({f"shard_{branch}": shard_breaker.state for branch, shard_breaker in shard_breakers.items()})
+    return jsonify({"rate_limiter": rate_limiter.snapshot(), "circuit_breakers": breakers}), 200
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+# Socket.IO channel: clients connect with auth {student_id, password} or {company_id, company_password}
+# and receive "application_status", "new_application" and "company_added" events for their own room.
+
+@socketio.on('connect')
+def socket_connect(auth):
+    auth = auth if isinstance(auth, dict) else {}
+    if auth.get('student_id'):
+        student_id, password = auth.get('student_id'), auth.get('password')
+        if not isinstance(student_id, str) or not isinstance(password, str):
+            raise ConnectionRefusedError("Invalid input")
+        student_data, status_code = validate_student_credentials(student_id, password)
+        if status_code != 200:
+            raise ConnectionRefusedError(student_data["error"])
+        join_room(student_topic(student_id))
+        if not student_data.is_placed:
+            student_presence.add(request.sid, student_id, student_data.percentage)
+    elif auth.get('company_id'):
+        company_id, company_password = auth.get('company_id'), auth.get('company_password')
+        if not isinstance(company_id, str) or not isinstance(company_password, str):
+            raise ConnectionRefusedError("Invalid input")
+        company_data, status_code = validate_company_credentials(company_id, company_password)
+        if status_code != 200:
+            raise ConnectionRefusedError(company_data["error"])
+        join_room(company_topic(company_id))
+    else:
+        raise ConnectionRefusedError("Missing student or company credentials")
+
+@socketio.on('disconnect')
+def socket_disconnect():
+    student_presence.remove(request.sid)
+
+# Bridge from the broker to this process's Socket.IO rooms
+def deliver_notification(topic, event, payload):
+    if topic == CATALOG_TOPIC:
+        for student_id in student_presence.eligible_students(payload["Required Percentage"]):
+            socketio.emit(event, payload, to=student_topic(student_id))
+    else:
+        socketio.emit(event, payload, to=topic)
+
+notification_broker.subscribe(deliver_notification)
+
 
 #--------------------------------------------------------------------------------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    if conn is None:
+    if conn is None and shard_router is None:
         print("Failed to connect to Snowflake. Exiting...")
     else:
-        app.run(debug=True)
\ No newline at end of file
+        socketio.run(app, debug=True)
\ No newline at end of file
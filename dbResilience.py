@@ -0,0 +1,195 @@
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from snowflake.connector import errors as snowflake_errors
+except ImportError:
+    snowflake_errors = None  # connector not installed (SQLite shard stand-in only)
+
+# Warehouse call layer settings
+STATEMENT_TIMEOUT_SECONDS = 15      # per-statement timeout passed to cursor.execute
+READ_RETRY_ATTEMPTS = 3             # total attempts for idempotent reads
+RETRY_BASE_DELAY_SECONDS = 0.2      # first backoff step, doubled on every retry
+RETRY_MAX_DELAY_SECONDS = 2.0       # cap for a single backoff sleep
+BREAKER_FAILURE_THRESHOLD = 5       # consecutive failures before the breaker opens
+BREAKER_RESET_SECONDS = 30          # how long the breaker stays open before a trial call
+STALE_CACHE_MAX_ENTRIES = 2048      # last good read results kept for stale serving
+STATEMENT_TIMEOUT_ERRNOS = {604, 630}   # Snowflake: statement canceled / reached its statement timeout
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Raised when no connection to the warehouse can be made
+class DatabaseUnavailableError(Exception):
+    pass
+
+
+# Raised when every pooled connection stays busy past the wait: the warehouse is fine, this process is at capacity
+class PoolSaturatedError(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Server busy, please retry later")
+        self.retry_after = retry_after
+
+
+# Raised inside a write transaction when a guarded statement changed fewer rows than expected (rolled back)
+class WriteConflictError(Exception):
+    pass
+
+
+# Raised instead of calling the warehouse while the breaker is open
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Database temporarily unavailable, please retry later")
+        self.retry_after = retry_after
+
+
+# Circuit breaker: CLOSED -> OPEN after too many consecutive failures,
+# OPEN -> HALF_OPEN once the reset timeout passes (a single trial call is let through),
+# HALF_OPEN -> CLOSED on success or back to OPEN on failure
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    # Decide whether a call may go to the warehouse right now
+    def allow_request(self):
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    # Let another trial call through when this one never reached the warehouse
+    def release_trial(self):
+        with self.lock:
+            self.trial_in_flight = False
+
+    # Seconds until the breaker will let a trial call through (used for Retry-After)
+    def retry_after(self):
+        with self.lock:
+            if self.state != self.OPEN:
+                return 1
+            remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+            return max(1, int(remaining + 0.999))
+
+
+# Bounded LRU of the last successful read results, keyed by (query, params)
+class StaleCache:
+    def __init__(self, max_entries=STALE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    # Returns (found, value)
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return False, None
+            self.entries.move_to_end(key)
+            return True, self.entries[key]
+
+    # Replace a cached value after a write, without caching keys nobody reads stale
+    def refresh(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.entries[key] = value
+
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to tell availability failures (connection lost, warehouse down, statement timeout) from errors in
+# the statement or data itself. Only the former count against the breaker and are worth retrying.
+def is_availability_error(error):
+    if isinstance(error, (DatabaseUnavailableError, sqlite3.OperationalError)):
+        return True
+    if snowflake_errors is None:
+        return False
+    if isinstance(error, (snowflake_errors.ProgrammingError, snowflake_errors.IntegrityError)):
+        return getattr(error, "errno", None) in STATEMENT_TIMEOUT_ERRNOS
+    return isinstance(error, (snowflake_errors.OperationalError, snowflake_errors.InterfaceError, snowflake_errors.DatabaseError))
+
+
+# Full-jitter exponential backoff for the given retry attempt (0-based)
+def backoff_delay(attempt):
+    return random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+
+# Run a warehouse operation through the breaker.
+# Idempotent operations are retried with jittered backoff; writes are attempted once.
+# Errors that are not availability failures (bad SQL, constraint violations) are raised straight away:
+# the warehouse answered, so they neither trip the breaker nor get retried. A saturated connection pool is not
+# the warehouse's fault either: the call is shed at once, without touching the breaker.
+# When allow_stale is set, good results are kept under cache_key and the last one is returned if the call cannot be served.
+def call_with_resilience(operation, breaker, idempotent=False, stale_cache=None, cache_key=None, allow_stale=False):
+    attempts = READ_RETRY_ATTEMPTS if idempotent else 1
+    last_error = None
+
+    for attempt in range(attempts):
+        if not breaker.allow_request():
+            last_error = CircuitOpenError(breaker.retry_after())
+            break
+        try:
+            result = operation()
+        except PoolSaturatedError as e:
+            breaker.release_trial()
+            last_error = e
+            break
+        except Exception as e:
+            if not is_availability_error(e):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            last_error = e
+            if attempt + 1 < attempts:
+                time.sleep(backoff_delay(attempt))
+            continue
+        breaker.record_success()
+        if allow_stale and stale_cache is not None and cache_key is not None:
+            stale_cache.put(cache_key, result)
+        return result
+
+    if allow_stale and stale_cache is not None and cache_key is not None:
+        found, value = stale_cache.get(cache_key)
+        if found:
+            return value
+    raise last_error
@@ -0,0 +1,151 @@
+import math
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dbResilience import DatabaseUnavailableError, PoolSaturatedError
+
+# Read/write routing settings
+READ_YOUR_WRITES_SECONDS = 5        # after a write, that session's reads stay on the primary this long
+POOL_WAIT_SECONDS = 2               # how long a caller waits for a free pooled connection
+
+# The writing client gets its last write time back in this cookie, so its next reads reach the primary
+# whichever process serves them
+READ_YOUR_WRITES_COOKIE = "portal_last_write"
+
+# Last writes of other sessions (e.g. the student an application decision changed) shared by every process
+# that points at the same SQLite file, off by default
+READ_YOUR_WRITES_STORE = os.environ.get('PORTAL_READ_YOUR_WRITES_STORE') or None
+
+READ_STATEMENT_PATTERN = re.compile(r"^\s*(SELECT|WITH|SHOW|DESCRIBE|DESC|EXPLAIN)\b", re.IGNORECASE)
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to classify a statement: reads may go to a replica, everything else goes to the primary
+def is_read_statement(query):
+    return READ_STATEMENT_PATTERN.match(query) is not None
+
+# Session keys used for read-your-writes (one per authenticated student or company)
+def student_session(student_id):
+    return f"student:{student_id}"
+
+def company_session(company_id):
+    return f"company:{company_id}"
+
+
+# Bounded pool of connections opened on demand by factory; a connection that raised is dropped
+class ConnectionPool:
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+
+    # Function to hand the pool a connection that is already open (e.g. the one opened at startup)
+    def add(self, connection):
+        self.idle.put(connection)
+
+    @contextmanager
+    def connection(self):
+        if not self.slots.acquire(timeout=POOL_WAIT_SECONDS):
+            raise PoolSaturatedError(max(1, math.ceil(POOL_WAIT_SECONDS)))
+        try:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                connection = self.factory()
+                if connection is None:
+                    raise DatabaseUnavailableError("Failed to create a database connection.")
+            try:
+                yield connection
+            except Exception:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+                raise
+            self.idle.put(connection)
+        finally:
+            self.slots.release()
+
+
+# Last write time per session, kept in this process
+class LocalWriteLog:
+    def __init__(self):
+        self.last_write = {}
+        self.lock = threading.Lock()
+
+    def record(self, session_keys, now, window_seconds):
+        with self.lock:
+            for key in session_keys:
+                self.last_write[key] = now
+            # drop sessions whose window has passed so the map stays small
+            if len(self.last_write) > 10000:
+                self.last_write = {key: at for key, at in self.last_write.items() if now - at < window_seconds}
+
+    def latest(self, session_keys):
+        with self.lock:
+            return max((self.last_write.get(key, float('-inf')) for key in session_keys), default=float('-inf'))
+
+
+# Last write time per session, shared by every process that points at the same SQLite file
+class SQLiteWriteLog:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS LAST_WRITE (SESSION_KEY TEXT PRIMARY KEY, WRITTEN_AT REAL)")
+        self.lock = threading.Lock()
+
+    def record(self, session_keys, now, window_seconds):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.executemany("INSERT OR REPLACE INTO LAST_WRITE (SESSION_KEY, WRITTEN_AT) VALUES (?, ?)",
+                                            [(key, now) for key in session_keys])
+                self.connection.execute("DELETE FROM LAST_WRITE WHERE WRITTEN_AT < ?", (now - window_seconds,))
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def latest(self, session_keys):
+        if not session_keys:
+            return float('-inf')
+        with self.lock:
+            placeholders = ", ".join("?" * len(session_keys))
+            row = self.connection.execute(f"SELECT MAX(WRITTEN_AT) FROM LAST_WRITE WHERE SESSION_KEY IN ({placeholders})",
+                                          list(session_keys)).fetchone()
+        return row[0] if row[0] is not None else float('-inf')
+
+
+# Remembers when each session last wrote, so its following reads are served by the primary.
+# Times are wall clock so they can be compared between processes and with the cookie value.
+class ReadYourWritesTracker:
+    def __init__(self, log=None, window_seconds=READ_YOUR_WRITES_SECONDS):
+        self.window_seconds = window_seconds
+        self.log = log if log is not None else LocalWriteLog()
+
+    # Returns the write time, for the client's READ_YOUR_WRITES_COOKIE
+    def record_write(self, session_keys):
+        now = time.time()
+        self.log.record(session_keys, now, self.window_seconds)
+        return now
+
+    # last_write_marker is the client's cookie value (or None)
+    def must_read_primary(self, session_keys, last_write_marker=None):
+        now = time.time()
+        if last_write_marker:
+            try:
+                if abs(now - float(last_write_marker)) < self.window_seconds:
+                    return True
+            except ValueError:
+                pass
+        return now - self.log.latest(session_keys) < self.window_seconds
+
+
+# Function to create the tracker for the configured store
+def create_write_tracker():
+    if READ_YOUR_WRITES_STORE:
+        return ReadYourWritesTracker(SQLiteWriteLog(READ_YOUR_WRITES_STORE))
+    return ReadYourWritesTracker()
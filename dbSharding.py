@@ -0,0 +1,249 @@
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dbRouting import ConnectionPool
+
+# Branch-sharded deployment: every branch lives in its own database (a Snowflake schema, or a
+# local SQLite file for testing). Students and companies are routed by their branch through a
+# small local directory of id -> branch; cross-branch reads run on all shards in parallel.
+
+VALID_BRANCHES = ["CS", "CIVIL", "ELECTRONIC", "MECH", "IT"]
+
+# Each shard numbers its applications from shard_index * APPLICATION_ID_SPAN, so an application id
+# alone tells which shard holds it. Snowflake shard schemas need their APPLICATION_ID identity to
+# START at the same offsets.
+APPLICATION_ID_SPAN = 1000000000
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS STUDENT (
+    ID TEXT PRIMARY KEY, NAME TEXT, ADMYEAR TEXT, PLACED TEXT DEFAULT 'No', SEM_WISE TEXT,
+    PERCENTAGE REAL, BRANCH TEXT, CERTIFIED_SKILLS TEXT, MARKS_SUM INTEGER, MARKS_COUNT INTEGER
+);
+CREATE TABLE IF NOT EXISTS COMPANY (
+    COMPANY_NAME TEXT, BRIEF_DESCRIPTION TEXT, REQUIRED_PERCENTAGE REAL, BRANCH TEXT,
+    REQUIRED_SKILLS TEXT, ID TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS APPLICATION (
+    APPLICATION_ID INTEGER PRIMARY KEY AUTOINCREMENT, STUDENT_ID TEXT, COMPANY_ID TEXT,
+    STATUS TEXT DEFAULT 'Pending'
+);
+"""
+
+# Columns added after the first shard files were created: (table, column, type)
+SQLITE_ADDED_COLUMNS = [
+    ("STUDENT", "MARKS_SUM", "INTEGER"),
+    ("STUDENT", "MARKS_COUNT", "INTEGER"),
+]
+
+PARAMETER_PATTERN = re.compile(r"%s")
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# SQLite stand-in exposing the part of the Snowflake connector API the app uses.
+# Runs in autocommit mode like Snowflake, so explicit BEGIN/COMMIT group statements.
+# Per-statement timeouts are accepted but not enforced.
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params=(), timeout=None):
+        self.cursor.execute(PARAMETER_PATTERN.sub("?", query), params or ())
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self.cursor.executemany(PARAMETER_PATTERN.sub("?", query), seq_of_params)
+        return self
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self.cursor.fetchmany(size)
+
+    def close(self):
+        self.cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path, shard_index=0, read_only=False):
+        if read_only:
+            self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, isolation_level=None, check_same_thread=False, timeout=15)
+            return
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=15)
+        self.connection.executescript(SQLITE_SCHEMA)
+        for table, column, column_type in SQLITE_ADDED_COLUMNS:
+            if column not in {info[1] for info in self.connection.execute(f"PRAGMA table_info({table})")}:
+                self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        # start this shard's application ids at its own offset
+        self.connection.execute(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'APPLICATION', ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'APPLICATION')",
+            (shard_index * APPLICATION_ID_SPAN,)
+        )
+
+    def cursor(self):
+        return SQLiteCursor(self.connection.cursor())
+
+    def commit(self):
+        if self.connection.in_transaction:
+            self.connection.execute("COMMIT")
+
+    def rollback(self):
+        if self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+
+    def close(self):
+        self.connection.close()
+
+
+# Function to make a connection factory for one SQLite shard file
+def sqlite_shard_factory(path, shard_index, read_only=False):
+    def factory():
+        return SQLiteConnection(path, shard_index, read_only)
+    return factory
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Routes work to per-branch databases through a bounded pool of connections per shard, opened lazily
+class ShardRouter:
+    def __init__(self, factories, pool_size):
+        self.factories = factories              # branch -> connection factory
+        self.branches = list(factories)
+        self.pools = {branch: ConnectionPool(factory, pool_size) for branch, factory in factories.items()}
+        self.executor = ThreadPoolExecutor(max_workers=len(self.branches), thread_name_prefix="shard")
+
+    # Borrow a shard connection for one operation: with router.connection(branch) as connection: ...
+    # A transaction must begin and commit inside the same with block.
+    def connection(self, branch):
+        return self.pools[branch].connection()
+
+    # Function to find the shard holding an application id (None if the id is not one of ours)
+    def branch_for_application(self, application_id):
+        try:
+            shard_index = int(application_id) // APPLICATION_ID_SPAN
+        except (TypeError, ValueError):
+            return None
+        if 0 <= shard_index < len(VALID_BRANCHES) and VALID_BRANCHES[shard_index] in self.factories:
+            return VALID_BRANCHES[shard_index]
+        return None
+
+    # Function to run operation(branch) on every shard in parallel; returns results in branch order
+    def scatter_gather(self, operation):
+        futures = [self.executor.submit(operation, branch) for branch in self.branches]
+        return [future.result() for future in futures]
+
+
+# Local id -> branch directory for students and companies, kept in a small SQLite file
+class ShardDirectory:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS DIRECTORY (KIND TEXT, ENTITY_ID TEXT, BRANCH TEXT, PRIMARY KEY (KIND, ENTITY_ID))"
+        )
+        self.lock = threading.Lock()
+        self.entries = {(kind, entity_id): branch for kind, entity_id, branch in self.connection.execute("SELECT KIND, ENTITY_ID, BRANCH FROM DIRECTORY")}
+
+    def branch_of(self, kind, entity_id):
+        return self.entries.get((kind, entity_id))
+
+    def register(self, kind, entity_id, branch):
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO DIRECTORY (KIND, ENTITY_ID, BRANCH) VALUES (?, ?, ?)", (kind, entity_id, branch))
+            self.entries[(kind, entity_id)] = branch
+
+    def remove(self, kind, entity_id):
+        with self.lock:
+            self.connection.execute("DELETE FROM DIRECTORY WHERE KIND = ? AND ENTITY_ID = ?", (kind, entity_id))
+            self.entries.pop((kind, entity_id), None)
+
+    def is_empty(self):
+        return not self.entries
+
+    # Function to replace the directory with (kind, entity_id, branch) entries read from the shards
+    def rebuild(self, entries):
+        with self.lock:
+            self.connection.execute("BEGIN")
+            self.connection.execute("DELETE FROM DIRECTORY")
+            self.connection.executemany("INSERT OR REPLACE INTO DIRECTORY (KIND, ENTITY_ID, BRANCH) VALUES (?, ?, ?)", entries)
+            self.connection.execute("COMMIT")
+            self.entries = {(kind, entity_id): branch for kind, entity_id, branch in entries}
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to build the router and directory for the configured sharding mode (None, None when off)
+def create_shard_router(mode, sqlite_directory, snowflake_schemas, connect_to_schema, pool_size):
+    if not mode:
+        return None, None
+    if mode == "sqlite":
+        os.makedirs(sqlite_directory, exist_ok=True)
+        factories = {
+            branch: sqlite_shard_factory(os.path.join(sqlite_directory, f"{branch}.sqlite3"), index)
+            for index, branch in enumerate(VALID_BRANCHES)
+        }
+        directory_path = os.path.join(sqlite_directory, "directory.sqlite3")
+    elif mode == "snowflake":
+        factories = {branch: (lambda schema=snowflake_schemas[branch]: connect_to_schema(schema)) for branch in VALID_BRANCHES}
+        directory_path = "shard_directory.sqlite3"
+    else:
+        raise ValueError(f"Unknown sharding mode {mode}")
+    return ShardRouter(factories, pool_size), ShardDirectory(directory_path)
+
+
+# Function to build read-only connection factories per branch: SQLite replica files or Snowflake schemas
+# on the read warehouse ({} when neither is configured)
+def create_replica_factories(mode, replica_directory, snowflake_schemas, connect_read_to_schema):
+    if mode == "sqlite" and replica_directory:
+        return {
+            branch: sqlite_shard_factory(os.path.join(replica_directory, f"{branch}.sqlite3"), index, read_only=True)
+            for index, branch in enumerate(VALID_BRANCHES)
+        }
+    if mode == "snowflake" and connect_read_to_schema is not None:
+        return {branch: (lambda schema=snowflake_schemas[branch]: connect_read_to_schema(schema)) for branch in VALID_BRANCHES}
+    return {}
+
+
+# Load the DataSet files into local SQLite shards: python dbSharding.py [directory]
+if __name__ == "__main__":
+    import json
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "shards"
+    router, shard_directory = create_shard_router("sqlite", target, None, None, 1)
+    base = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base, "DataSet", "studentData.json")) as file:
+        student_data = json.load(file)
+    with open(os.path.join(base, "DataSet", "companyData.json")) as file:
+        company_data = json.load(file)
+
+    entries = []
+    for branch in VALID_BRANCHES:
+        with router.connection(branch) as connection:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN")
+            for student_id, student in student_data.get(branch, {}).items():
+                cursor.execute(
+                    "INSERT OR REPLACE INTO STUDENT (ID, NAME, BRANCH, ADMYEAR, PLACED, SEM_WISE, PERCENTAGE, CERTIFIED_SKILLS, MARKS_SUM, MARKS_COUNT) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                    (student_id, student["Name"], branch, student["AdmYear"], student["Placed"], ",".join(map(str, student["Sem_Wise"])),
+                     student["Percentage"], ", ".join(student["Certified Skills"]), sum(student["Sem_Wise"]), len(student["Sem_Wise"]))
+                )
+                entries.append(("student", student_id, branch))
+            for company_id, company in company_data.get(branch, {}).items():
+                cursor.execute(
+                    "INSERT OR REPLACE INTO COMPANY (COMPANY_NAME, BRIEF_DESCRIPTION, REQUIRED_PERCENTAGE, BRANCH, REQUIRED_SKILLS, ID) VALUES (%s, %s, %s, %s, %s, %s)",
+                    (company["Company Name"], company["Brief Description"], company["Required Percentage"], branch, company["Required Skills"], company_id)
+                )
+                entries.append(("company", company_id, branch))
+            connection.commit()
+            cursor.close()
+    shard_directory.rebuild(entries)
+    print(f"Loaded {len(entries)} students and companies into {len(VALID_BRANCHES)} shards under {target}/")
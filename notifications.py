@@ -0,0 +1,76 @@
+import threading
+
+# Real-time notification fan-out.
+# Routes publish (topic, event, payload) to a broker; every process subscribes one bridge that
+# forwards messages to its own Socket.IO clients. The LocalBroker below delivers in-process only;
+# a shared broker (e.g. Redis pub/sub) only needs the same publish/subscribe/unsubscribe methods
+# to fan out across several app instances.
+
+CATALOG_TOPIC = "catalog"   # company catalog changes, filtered per student by the bridge
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Topic (and Socket.IO room) names
+def student_topic(student_id):
+    return f"student:{student_id}"
+
+def company_topic(company_id):
+    return f"company:{company_id}"
+
+
+# In-process publish/subscribe broker
+class LocalBroker:
+    def __init__(self):
+        self.subscribers = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, callback):
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    # Deliver to every subscriber; a failing subscriber must not break the publishing route
+    def publish(self, topic, event, payload):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(topic, event, payload)
+            except Exception as e:
+                print(f"Error delivering {event} to {topic}: {e}")
+
+
+# Connected students per process, so catalog events only reach students who are eligible
+class StudentPresence:
+    def __init__(self):
+        self.students = {}   # sid -> (student_id, percentage)
+        self.lock = threading.Lock()
+
+    def add(self, sid, student_id, percentage):
+        with self.lock:
+            self.students[sid] = (student_id, percentage)
+
+    def remove(self, sid):
+        with self.lock:
+            self.students.pop(sid, None)
+
+    # Placed students stop receiving catalog events
+    def remove_student(self, student_id):
+        with self.lock:
+            for sid in [sid for sid, (connected_id, _) in self.students.items() if connected_id == student_id]:
+                del self.students[sid]
+
+    # A student's percentage changed (new semester marks)
+    def update_percentage(self, student_id, percentage):
+        with self.lock:
+            for sid, (connected_id, _) in self.students.items():
+                if connected_id == student_id:
+                    self.students[sid] = (student_id, percentage)
+
+    def eligible_students(self, required_percentage):
+        with self.lock:
+            return {student_id for student_id, percentage in self.students.values() if percentage >= required_percentage}
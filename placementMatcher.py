@@ -0,0 +1,181 @@
+import heapq
+import time
+import tracemalloc
+import numpy as np
+
+# Batch placement matching: every unplaced student against every company with seats.
+# Scores reproduce calculate_placement_likelihood for the whole population at once, and
+# a student-proposing deferred acceptance (stable matching with capacities) assigns seats.
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to score every student against every company.
+# Returns (scores, acceptable): float32 likelihoods and a mask of pairs that could apply
+# (percentage met and at least one matching skill, the same rules as /student/apply).
+# excluded_pairs holds (student_id, company_id) pairs that are never acceptable, e.g. rejected applications.
+def score_matrix(students, companies, weight=0.5, branch_weight=0.2, excluded_pairs=()):
+    student_count, company_count = len(students), len(companies)
+
+    # Skill vocabulary from the company side, students only matter where they overlap
+    vocabulary = {}
+    for company in companies:
+        for skill in company.skills:
+            vocabulary.setdefault(skill, len(vocabulary))
+
+    student_skills = np.zeros((student_count, max(len(vocabulary), 1)), dtype=np.float32)
+    company_skills = np.zeros((company_count, max(len(vocabulary), 1)), dtype=np.float32)
+    for row, student in enumerate(students):
+        columns = [vocabulary[skill] for skill in student.skills if skill in vocabulary]
+        student_skills[row, columns] = 1.0
+    for row, company in enumerate(companies):
+        company_skills[row, [vocabulary[skill] for skill in company.skills]] = 1.0
+
+    matching_counts = student_skills @ company_skills.T
+    required_counts = company_skills.sum(axis=1)
+
+    student_percentage = np.fromiter((student.percentage for student in students), dtype=np.float32, count=student_count)
+    required_percentage = np.fromiter((company.required_percentage for company in companies), dtype=np.float32, count=company_count)
+
+    branch_codes = {}
+    student_branch = np.fromiter((branch_codes.setdefault(student.branch, len(branch_codes)) for student in students), dtype=np.int32, count=student_count)
+    company_branch = np.fromiter((branch_codes.setdefault(company.branch, len(branch_codes)) for company in companies), dtype=np.int32, count=company_count)
+
+    eligible = student_percentage[:, None] >= required_percentage[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skills_match_percentage = np.where(required_counts > 0, matching_counts / required_counts, 0) * 100
+        percentage_match = np.where(required_percentage > 0, student_percentage[:, None] / required_percentage[None, :], 0) * 100
+    branch_match = (student_branch[:, None] == company_branch[None, :]).astype(np.float32)
+
+    scores = (skills_match_percentage + percentage_match) * weight + branch_match * branch_weight
+    scores = np.where(required_counts[None, :] > 0, scores, 25.0)   # no required skills -> 25% default
+    scores = np.where(eligible, scores, 0.0).astype(np.float32)
+
+    acceptable = eligible & (matching_counts > 0)
+    if excluded_pairs:
+        student_rows = {student.student_id: row for row, student in enumerate(students)}
+        company_rows = {company.company_id: row for row, company in enumerate(companies)}
+        for student_id, company_id in excluded_pairs:
+            if student_id in student_rows and company_id in company_rows:
+                acceptable[student_rows[student_id], company_rows[company_id]] = False
+    return scores, acceptable
+
+
+# Function to run student-proposing deferred acceptance with company capacities.
+# Companies rank applicants by the same likelihood score. Returns (assignment, proposals)
+# where assignment[i] is the company index for student i or -1.
+def deferred_acceptance(scores, acceptable, capacities):
+    student_count = scores.shape[0]
+
+    # Preference lists: acceptable companies by descending score (ties -> lower company index),
+    # kept as plain lists with their scores alongside so the proposal loop avoids numpy scalar access
+    ranked = np.where(acceptable, scores, -np.inf)
+    order = np.argsort(-ranked, axis=1, kind='stable')
+    ordered_scores = np.take_along_axis(scores, order, axis=1)
+    preference_lengths = acceptable.sum(axis=1).tolist()
+    preferences = [order[student, :preference_lengths[student]].tolist() for student in range(student_count)]
+    preference_scores = [ordered_scores[student, :preference_lengths[student]].tolist() for student in range(student_count)]
+    del ranked, order, ordered_scores
+
+    seats = [int(seat) for seat in capacities]
+    next_choice = [0] * student_count
+    assignment = [-1] * student_count
+    held = [[] for _ in seats]   # min-heap of (score, -student) per company
+    free = [student for student in range(student_count - 1, -1, -1) if preference_lengths[student] > 0]
+    proposals = 0
+
+    while free:
+        student = free.pop()
+        choice = next_choice[student]
+        if choice >= preference_lengths[student]:
+            continue
+        company = preferences[student][choice]
+        next_choice[student] = choice + 1
+        proposals += 1
+
+        capacity = seats[company]
+        if capacity <= 0:
+            free.append(student)
+            continue
+
+        entry = (preference_scores[student][choice], -student)
+        heap = held[company]
+        if len(heap) < capacity:
+            heapq.heappush(heap, entry)
+            assignment[student] = company
+        elif entry > heap[0]:
+            _, rejected = heapq.heapreplace(heap, entry)
+            assignment[student] = company
+            assignment[-rejected] = -1
+            free.append(-rejected)
+        else:
+            free.append(student)
+
+    return np.array(assignment, dtype=np.int64), proposals
+
+
+# Function to run a whole placement drive in memory and report its runtime and memory.
+# capacities maps company_id -> seats, companies without an entry get default_seats; excluded_pairs are never matched.
+# trace_memory adds the tracemalloc peak, it slows the proposal loop several times over.
+def run_placement_drive(students, companies, capacities=None, default_seats=1, excluded_pairs=(), trace_memory=False):
+    capacities = capacities or {}
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        scores, acceptable = score_matrix(students, companies, excluded_pairs=excluded_pairs)
+        scored = time.perf_counter()
+        seats = np.array([capacities.get(company.company_id, default_seats) for company in companies], dtype=np.int64)
+        assignment, proposals = deferred_acceptance(scores, acceptable, seats)
+        finished = time.perf_counter()
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    placements = [
+        (students[student].student_id, companies[company].company_id, float(scores[student, company]))
+        for student, company in enumerate(assignment.tolist())
+        if company >= 0
+    ]
+    stats = {
+        "students":          len(students),
+        "companies":         len(companies),
+        "seats":             int(seats.sum()),
+        "placed":            len(placements),
+        "proposals":         proposals,
+        "scoring_ms":        round((scored - started) * 1000, 2),
+        "matching_ms":       round((finished - scored) * 1000, 2),
+        "runtime_ms":        round((finished - started) * 1000, 2),
+        "matrix_memory_mb":  round((scores.nbytes + acceptable.nbytes) / (1024 * 1024), 2),
+    }
+    if peak_memory is not None:
+        stats["peak_memory_mb"] = round(peak_memory / (1024 * 1024), 2)
+    return placements, stats
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Synthetic 10k students x 500 companies benchmark: python placementMatcher.py
+if __name__ == "__main__":
+    import random
+    from records import Student, Company
+
+    random.seed(7)
+    branches = ["CS", "CIVIL", "ELECTRONIC", "MECH", "IT"]
+    skill_pool = [f"Skill {number}" for number in range(120)]
+
+    companies = [
+        Company(f"Company {number}", "Synthetic company", random.randint(40, 80), random.choice(branches),
+                ", ".join(random.sample(skill_pool, 4)), str(number))
+        for number in range(500)
+    ]
+    students = []
+    for number in range(10000):
+        marks = [random.randint(35, 100) for _ in range(8)]
+        students.append(Student(f"S{number:05d}", f"Student {number}", "2021", "No", ",".join(map(str, marks)),
+                                sum(marks) / len(marks), random.choice(branches), ", ".join(random.sample(skill_pool, 6))))
+
+    _, stats = run_placement_drive(students, companies, default_seats=15)
+    _, traced = run_placement_drive(students, companies, default_seats=15, trace_memory=True)
+    stats["peak_memory_mb"] = traced["peak_memory_mb"]
+    for key, value in stats.items():
+        print(f"{key:>16}: {value}")
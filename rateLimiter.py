@@ -0,0 +1,136 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+
+# Per-principal rate limiting and admission control.
+# Buckets are keyed by (principal, cost class); an empty bucket answers 429. Each cost class also caps
+# its in-flight requests; when the cap is reached the request is shed with 503.
+
+COST_CLASSES = {
+    # warehouse scans such as /student/eligibility and /company/applications
+    "expensive": {"capacity": 10, "refill_per_second": 0.5, "max_in_flight": 8},
+    # whole-population jobs such as placement drives and exports
+    "batch":     {"capacity": 2,  "refill_per_second": 1 / 60, "max_in_flight": 2},
+    # everything else
+    "standard":  {"capacity": 30, "refill_per_second": 5, "max_in_flight": 64},
+}
+DEFAULT_COST_CLASS = "standard"
+
+# Shared bucket state across processes (a local SQLite file standing in for a shared store), off by default
+RATE_LIMIT_STORE = os.environ.get('PORTAL_RATE_LIMIT_STORE') or None
+
+MAX_LOCAL_BUCKETS = 50000
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to refill a bucket and try to take one token; returns (allowed, tokens_left, retry_after_seconds)
+def take_token(tokens, updated_at, now, capacity, refill_per_second):
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, max(1, math.ceil((1 - tokens) / refill_per_second))
+
+
+# Buckets kept in this process
+class LocalBucketStore:
+    def __init__(self):
+        self.buckets = {}   # key -> (tokens, updated_at)
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, refill_per_second):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.get(key, (capacity, now))
+            allowed, tokens, retry_after = take_token(tokens, updated_at, now, capacity, refill_per_second)
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > MAX_LOCAL_BUCKETS:
+                self.evict_idle(now)
+        return allowed, retry_after
+
+    # Buckets that would be full again carry no state, so they can be dropped
+    def evict_idle(self, now):
+        idle_seconds = max(config["capacity"] / config["refill_per_second"] for config in COST_CLASSES.values())
+        self.buckets = {key: value for key, value in self.buckets.items() if now - value[1] < idle_seconds}
+
+    def size(self):
+        with self.lock:
+            return len(self.buckets)
+
+
+# Buckets shared by every process that points at the same SQLite file
+class SQLiteBucketStore:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS BUCKETS (BUCKET_KEY TEXT PRIMARY KEY, TOKENS REAL, UPDATED_AT REAL)")
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, refill_per_second):
+        now = time.time()   # wall clock, shared between processes
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.connection.execute("SELECT TOKENS, UPDATED_AT FROM BUCKETS WHERE BUCKET_KEY = ?", (key,)).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                allowed, tokens, retry_after = take_token(tokens, updated_at, now, capacity, refill_per_second)
+                self.connection.execute("INSERT OR REPLACE INTO BUCKETS (BUCKET_KEY, TOKENS, UPDATED_AT) VALUES (?, ?, ?)", (key, tokens, now))
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    def size(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM BUCKETS").fetchone()[0]
+
+
+# Token buckets per (principal, cost class) plus in-flight caps per cost class, with counters for /metrics
+class RateLimiter:
+    def __init__(self, store=None):
+        self.store = store if store is not None else LocalBucketStore()
+        self.in_flight = {cost_class: 0 for cost_class in COST_CLASSES}
+        self.counters = {cost_class: {"allowed": 0, "throttled": 0, "shed": 0} for cost_class in COST_CLASSES}
+        self.lock = threading.Lock()
+
+    # Function to take a token from the principal's bucket; returns (status, retry_after), status None or 429
+    def throttle(self, principal, cost_class):
+        config = COST_CLASSES[cost_class]
+        allowed, retry_after = self.store.take(f"{cost_class}:{principal}", config["capacity"], config["refill_per_second"])
+        if not allowed:
+            with self.lock:
+                self.counters[cost_class]["throttled"] += 1
+            return 429, retry_after
+        return None, 0
+
+    # Function to claim an in-flight slot; returns (status, retry_after), status None or 503.
+    # A request that got a slot must call release(cost_class) when it finishes.
+    def enter(self, cost_class):
+        config = COST_CLASSES[cost_class]
+        with self.lock:
+            if self.in_flight[cost_class] >= config["max_in_flight"]:
+                self.counters[cost_class]["shed"] += 1
+                return 503, 1
+            self.in_flight[cost_class] += 1
+            self.counters[cost_class]["allowed"] += 1
+        return None, 0
+
+    def release(self, cost_class):
+        with self.lock:
+            self.in_flight[cost_class] = max(0, self.in_flight[cost_class] - 1)
+
+    def snapshot(self):
+        with self.lock:
+            classes = {
+                cost_class: dict(self.counters[cost_class], in_flight=self.in_flight[cost_class], **COST_CLASSES[cost_class])
+                for cost_class in COST_CLASSES
+            }
+        return {"store": type(self.store).__name__, "buckets": self.store.size(), "cost_classes": classes}
+
+
+# Function to create the limiter for the configured store
+def create_rate_limiter():
+    if RATE_LIMIT_STORE:
+        return RateLimiter(SQLiteBucketStore(RATE_LIMIT_STORE))
+    return RateLimiter()
@@ -0,0 +1,148 @@
+import sys
+from array import array
+
+# Typed records built once per fetched row.
+# Column positions follow the warehouse tables:
+#   STUDENT     -> ID, NAME, ADMYEAR, PLACED, SEM_WISE, PERCENTAGE, BRANCH, CERTIFIED_SKILLS, MARKS_SUM, MARKS_COUNT
+#   COMPANY     -> COMPANY_NAME, BRIEF_DESCRIPTION, REQUIRED_PERCENTAGE, BRANCH, REQUIRED_SKILLS, ID
+#   APPLICATION -> APPLICATION_ID, STUDENT_ID, COMPANY_ID, STATUS (+ COMPANY_NAME when joined)
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to split a comma-separated skills string into a set (same rules the routes always used)
+def parse_skills(skills):
+    if not skills:
+        return frozenset()
+    return frozenset(sys.intern(skill.strip()) for skill in skills.split(','))
+
+# Function to split a skills string into an ordered tuple of shared strings (duplicates dropped)
+def parse_skill_list(skills):
+    if not skills:
+        return ()
+    return tuple(dict.fromkeys(sys.intern(skill.strip()) for skill in skills.split(',')))
+
+# Function to parse the semester-wise marks string into a compact integer array
+def parse_marks(semester_wise_marks):
+    if not semester_wise_marks:
+        return array('i')
+    try:
+        return array('i', map(int, semester_wise_marks.split(',')))
+    except ValueError:
+        return array('i')
+
+# Branch codes repeat on every row, so share one string object per code
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Students are bulk-loaded, so only the parsed forms are kept: the marks array and the skills tuple
+# (whose strings are interned and shared between students). The stored text columns are rendered from them.
+class Student:
+    __slots__ = ('student_id', 'name', 'admission_year', 'placed', 'marks', 'percentage', 'branch', 'skills',
+                 'marks_sum', 'marks_count')
+
+    def __init__(self, student_id, name, admission_year, placed, semester_wise_marks, percentage, branch, certified_skills,
+                 marks_sum=None, marks_count=None):
+        self.student_id = student_id
+        self.name = name
+        self.admission_year = admission_year
+        self.placed = intern_text(placed)
+        self.marks = parse_marks(semester_wise_marks)
+        self.percentage = float(percentage)
+        self.branch = intern_text(branch)
+        self.skills = parse_skill_list(certified_skills)
+        self.marks_sum = marks_sum                          # running aggregates, None until first stored
+        self.marks_count = marks_count
+
+    @property
+    def semester_wise_marks(self):
+        return ",".join(map(str, self.marks))
+
+    @property
+    def certified_skills(self):
+        return ", ".join(self.skills)
+
+    # Rows from a table without the aggregate columns have only the first eight values
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return None
+        return cls(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], *row[8:10])
+
+    def to_row(self):
+        return (self.student_id, self.name, self.admission_year, self.placed, self.semester_wise_marks,
+                self.percentage, self.branch, self.certified_skills, self.marks_sum, self.marks_count)
+
+    # Function to get (sum, count) of the semester marks, derived from SEM_WISE when not stored yet
+    def marks_totals(self):
+        if self.marks_sum is None or self.marks_count is None:
+            return sum(self.marks), len(self.marks)
+        return int(self.marks_sum), int(self.marks_count)
+
+    # Function to append (semester = count + 1) or correct one semester's marks in O(1).
+    # Returns the new (semester_wise_marks, marks_sum, marks_count, percentage); the record is not changed.
+    def with_semester_marks(self, semester, semester_marks):
+        marks_sum, marks_count = self.marks_totals()
+        marks = list(self.marks)
+        if semester == marks_count + 1:
+            marks.append(semester_marks)
+            marks_sum += semester_marks
+            marks_count += 1
+        elif 1 <= semester <= marks_count:
+            marks_sum += semester_marks - marks[semester - 1]
+            marks[semester - 1] = semester_marks
+        else:
+            raise ValueError(f"semester should be between 1 and {marks_count + 1}")
+        return ",".join(map(str, marks)), marks_sum, marks_count, marks_sum / marks_count
+
+    @property
+    def is_placed(self):
+        return self.placed == "Yes"
+
+
+class Company:
+    __slots__ = ('name', 'brief_description', 'required_percentage', 'branch', 'required_skills', 'company_id', 'skills')
+
+    def __init__(self, name, brief_description, required_percentage, branch, required_skills, company_id):
+        self.name = name
+        self.brief_description = brief_description
+        self.required_percentage = float(required_percentage)
+        self.branch = intern_text(branch)
+        self.required_skills = required_skills              # raw string as stored
+        self.company_id = company_id
+        self.skills = parse_skills(required_skills)
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return None
+        return cls(row[0], row[1], row[2], row[3], row[4], row[5])
+
+
+class Application:
+    __slots__ = ('application_id', 'student_id', 'company_id', 'status', 'company_name')
+
+    def __init__(self, application_id, student_id, company_id, status, company_name=None):
+        self.application_id = int(application_id)
+        self.student_id = student_id
+        self.company_id = company_id
+        self.status = intern_text(status)
+        self.company_name = company_name
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return None
+        return cls(*row)
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Functions to build record lists from fetched rows
+def students_from_rows(rows):
+    return [Student.from_row(row) for row in rows]
+
+def companies_from_rows(rows):
+    return [Company.from_row(row) for row in rows]
+
+def applications_from_rows(rows):
+    return [Application.from_row(row) for row in rows]
@@ -0,0 +1,59 @@
+import csv
+import io
+import zlib
+from flask import current_app, stream_with_context
+
+# Streaming CSV exports.
+# Rows arrive in fetchmany batches and leave as one chunk per batch, so memory stays bounded by a
+# batch whatever the row count. The file opens with a UTF-8 byte order mark so Excel picks the right
+# encoding, and text cells that Excel would read as a formula are prefixed with an apostrophe.
+
+REPORT_BATCH_ROWS = 2000                    # rows per fetchmany call and per response chunk
+REPORT_STATEMENT_TIMEOUT_SECONDS = 300      # export queries scan whole tables
+GZIP_LEVEL = 6
+
+UTF8_BOM = "\ufeff".encode("utf-8")
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to keep a text cell from being evaluated as a spreadsheet formula
+def excel_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+# Function to turn batches of rows into CSV byte chunks (header first)
+def csv_chunks(header, row_batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield UTF8_BOM + buffer.getvalue().encode("utf-8")
+    for rows in row_batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([excel_safe(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+# Function to gzip a stream of chunks; every chunk is flushed so the client keeps receiving data
+def gzip_chunks(chunks, level=GZIP_LEVEL):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)   # wbits 31 -> gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+# Function to build the streamed CSV download.
+# The request context stays open until the last chunk, so teardown hooks run after the stream ends.
+def csv_response(filename, header, row_batches, compress=False):
+    chunks = csv_chunks(header, row_batches)
+    if compress:
+        chunks = gzip_chunks(chunks)
+    response = current_app.response_class(stream_with_context(chunks), mimetype="text/csv")
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["Cache-Control"] = "no-store"
+    response.headers["Vary"] = "Accept-Encoding"
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
@@ -0,0 +1,96 @@
+import html
+import json
+import math
+from functools import lru_cache
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional. The stdlib fallback writes the same JSON except for float exponents,
+# which Python renders with a sign and padding (1e+16, 1e-07) and orjson without (1e16, 1e-7).
+try:
+    import orjson
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+except ImportError:
+    orjson = None
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to write a non-string object key the way orjson does
+def json_key(key):
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    return key  # anything else is left for json.dumps to reject
+
+# Function to bring a value to what orjson writes before the stdlib encoder sees it:
+# NaN and infinities become null, and keys become strings first so mixed keys sort as strings
+def orjson_compatible(obj):
+    if isinstance(obj, dict):
+        return {key if type(key) is str else json_key(key): orjson_compatible(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [orjson_compatible(value) for value in obj]
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+# Function to serialize a value to compact, key-sorted UTF-8 JSON bytes.
+# Dates, decimals and other extra types always go through default (Flask's rules), on both paths.
+def dumps_bytes(obj, default=DefaultJSONProvider.default):
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+    return json.dumps(orjson_compatible(obj), default=default, sort_keys=True, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+# Function to serialize one object member ("key":value) for hand-assembled bodies
+def json_member(key, value):
+    return dumps_bytes(key) + b":" + dumps_bytes(value)
+
+# Function to wrap already serialized JSON bytes in a response (same framing as jsonify)
+def json_bytes_response(body, status=200):
+    return current_app.response_class(body + b"\n", status=status, mimetype=current_app.json.mimetype)
+
+
+# Flask JSON provider used by jsonify: orjson when installed, stdlib otherwise
+class FastJSONProvider(DefaultJSONProvider):
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, default=kwargs.get("default", self.default)).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return json_bytes_response(dumps_bytes(obj, default=self.default))
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Escaped and serialized company members of an eligibility entry, cached per catalog row.
+# Entries are emitted with sorted keys, so the company members split into the part that sorts
+# before "Matching Skills"/"Placement Likelihood" (head) and the part that sorts after (tail).
+@lru_cache(maxsize=4096)
+def company_eligibility_fragments(company_id, name, brief_description, required_percentage, branch, required_skills):
+    head = b",".join([
+        json_member("Branch", html.escape(branch)),
+        json_member("Brief Description", html.escape(brief_description)),
+        json_member("Company ID", html.escape(company_id)),
+        json_member("Company Name", html.escape(name)),
+    ])
+    tail = b",".join([
+        json_member("Required Percentage", required_percentage),
+        json_member("Required Skills", html.escape(required_skills)),
+    ])
+    return head, tail
+
+# Function to serialize one eligibility entry from cached company fragments and per-student members
+def eligibility_entry_bytes(company_fragments, matching_skills, likelihood, student_members):
+    head, tail = company_fragments
+    return b"".join([
+        b"{", head, b",",
+        json_member("Matching Skills", matching_skills), b",",
+        json_member("Placement Likelihood", likelihood), b",",
+        tail, b",", student_members, b"}",
+    ])
@@ -0,0 +1,166 @@
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Field weights used to rank search hits
+FIELD_WEIGHTS = {
+    "name": 3,
+    "skills": 2,
+    "description": 1,
+}
+
+#--------------------------------------------------------------------------------------------------------------------------------------------------
+
+# Function to split text into lowercase search tokens
+def tokenize(text):
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+# Prefix trie mapping lowercase keys to a reference-counted set of values
+class PrefixTrie:
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, key, value):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        values = node.setdefault(None, {})
+        values[value] = values.get(value, 0) + 1
+
+    def remove(self, key, value):
+        path = []
+        node = self.root
+        for char in key:
+            if char not in node:
+                return
+            path.append((node, char))
+            node = node[char]
+        values = node.get(None)
+        if not values or value not in values:
+            return
+        values[value] -= 1
+        if values[value] == 0:
+            del values[value]
+        if not values:
+            del node[None]
+        # prune branches that no longer lead to any value
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    # Returns {value: count} for every key starting with prefix
+    def values_with_prefix(self, prefix):
+        node = self.root
+        for char in prefix:
+            if char not in node:
+                return {}
+            node = node[char]
+        found = {}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for char, child in current.items():
+                if char is None:
+                    for value, count in child.items():
+                        found[value] = found.get(value, 0) + count
+                else:
+                    stack.append(child)
+        return found
+
+
+# In-memory text index over the company catalog:
+#   postings   token -> {company_id: weight} over Company Name, Brief Description and Required Skills
+#   tokens     prefix trie of the token vocabulary, so the last query word can be partial
+#   skills     prefix trie of the skill vocabulary for autocomplete (counted per company)
+class CompanySearchIndex:
+    def __init__(self):
+        self.companies = {}
+        self.postings = {}
+        self.tokens = PrefixTrie()
+        self.skills = PrefixTrie()
+        self.built = False
+        self.lock = threading.RLock()
+
+    # Function to (re)build the whole index from a list of Company records
+    def build(self, companies):
+        with self.lock:
+            self.companies = {}
+            self.postings = {}
+            self.tokens = PrefixTrie()
+            self.skills = PrefixTrie()
+            for company in companies:
+                self.add(company)
+            self.built = True
+
+    # Weighted tokens of a company across the indexed fields
+    def company_tokens(self, company):
+        weights = {}
+        fields = (("name", company.name), ("description", company.brief_description), ("skills", company.required_skills))
+        for field, text in fields:
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0) + FIELD_WEIGHTS[field]
+        return weights
+
+    def add(self, company):
+        with self.lock:
+            if company.company_id in self.companies:
+                self.remove(company.company_id)
+            self.companies[company.company_id] = company
+            for token, weight in self.company_tokens(company).items():
+                self.postings.setdefault(token, {})[company.company_id] = weight
+                self.tokens.insert(token, token)
+            for skill in company.skills:
+                if skill:
+                    self.skills.insert(skill.lower(), skill)
+
+    def remove(self, company_id):
+        with self.lock:
+            company = self.companies.pop(company_id, None)
+            if company is None:
+                return
+            for token in self.company_tokens(company):
+                posting = self.postings.get(token)
+                if posting is not None:
+                    posting.pop(company_id, None)
+                    if not posting:
+                        del self.postings[token]
+                self.tokens.remove(token, token)
+            for skill in company.skills:
+                if skill:
+                    self.skills.remove(skill.lower(), skill)
+
+    # Function to find companies matching every query word (the last word may be a prefix), best first
+    def search(self, query, limit=20):
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        with self.lock:
+            scores = None
+            for position, token in enumerate(query_tokens):
+                if position == len(query_tokens) - 1:
+                    candidates = {}
+                    for expanded in self.tokens.values_with_prefix(token):
+                        for company_id, weight in self.postings.get(expanded, {}).items():
+                            candidates[company_id] = max(candidates.get(company_id, 0), weight)
+                else:
+                    candidates = self.postings.get(token, {})
+                if scores is None:
+                    scores = dict(candidates)
+                else:
+                    scores = {company_id: score + candidates[company_id] for company_id, score in scores.items() if company_id in candidates}
+                if not scores:
+                    return []
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [self.companies[company_id] for company_id, _ in ranked]
+
+    # Function to suggest skills starting with prefix, most required first
+    def autocomplete_skills(self, prefix, limit=10):
+        with self.lock:
+            counts = self.skills.values_with_prefix(prefix.strip().lower())
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0].lower()))[:limit]
+        return [skill for skill, _ in ranked]
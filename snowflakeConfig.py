@@ -1,7 +1,9 @@
+import os
 import snowflake.connector
 
 STUDENT_DEFAULT_PASSWORD = "student123"     # default student password
 COMPANY_PASSWORD = 'company*123'            #default company password
+PLACEMENT_OFFICE_PASSWORD = 'placement*123' #placement office password (batch drives and reports)
 
 # Snowflake connection parameters
 SNOWFLAKE_ACCOUNT = 'gazzvap-iw54421'
@@ -9,16 +11,74 @@ SNOWFLAKE_USER = 'KAUSTUBH'
 SNOWFLAKE_PASSWORD = 'Qwerty*123'
 SNOWFLAKE_DATABASE = 'UNIVERSITYPLACEMENTPORTAL'
 SNOWFLAKE_SCHEMA = 'PUBLIC'
+SNOWFLAKE_LOGIN_TIMEOUT = 10        # seconds to wait while opening a session
+SNOWFLAKE_NETWORK_TIMEOUT = 30      # seconds to wait on a single network request
+
+# Read-only connections (set SNOWFLAKE_READ_WAREHOUSE to route reads away from the primary)
+SNOWFLAKE_READ_WAREHOUSE = None     # e.g. 'PORTAL_READ_WH'
+SNOWFLAKE_READ_ROLE = None          # role with SELECT-only grants
+SNOWFLAKE_READ_POOL_SIZE = 4
+SNOWFLAKE_POOL_SIZE = 8             # primary connections kept when not sharded
+
+# SQLite sharding only: read-only copies of the shard files standing in for read replicas
+# (refresh them by copying the shard files over, e.g. python dbSharding.py <directory>)
+READ_REPLICA_DIRECTORY = os.environ.get('PORTAL_READ_REPLICA_DIRECTORY') or None
+
+# Branch sharding: None (single database), 'snowflake' (one schema per branch) or 'sqlite' (local shard files)
+SHARDING_MODE = os.environ.get('PORTAL_SHARDING_MODE') or None
+SHARD_SQLITE_DIRECTORY = os.environ.get('PORTAL_SHARD_DIRECTORY', 'shards')
+SHARD_POOL_SIZE = 8                 # connections kept per shard
+SHARD_SCHEMAS = {
+    "CS":         "PLACEMENT_CS",
+    "CIVIL":      "PLACEMENT_CIVIL",
+    "ELECTRONIC": "PLACEMENT_ELECTRONIC",
+    "MECH":       "PLACEMENT_MECH",
+    "IT":         "PLACEMENT_IT",
+}
+
+# Columns added after the original tables were created: (table, column, type).
+# The app adds any that are missing when it starts (the SQLite shards do the same when opened).
+SNOWFLAKE_ADDED_COLUMNS = [
+    ("STUDENT", "MARKS_SUM",   "NUMBER(38,0)"),
+    ("STUDENT", "MARKS_COUNT", "NUMBER(38,0)"),
+]
 
 # Initialize Snowflake connection
 connection = None
 
-def init_snowflake_connection():
+def init_snowflake_connection(schema=SNOWFLAKE_SCHEMA):
     connection = snowflake.connector.connect(
         user=SNOWFLAKE_USER,
         password=SNOWFLAKE_PASSWORD,
         account=SNOWFLAKE_ACCOUNT,
         database=SNOWFLAKE_DATABASE,
-        schema=SNOWFLAKE_SCHEMA
+        schema=schema,
+        login_timeout=SNOWFLAKE_LOGIN_TIMEOUT,
+        network_timeout=SNOWFLAKE_NETWORK_TIMEOUT
     )
-    return connection
\ No newline at end of file
+    return connection
+
+# Read-only connection on the separate read warehouse
+def init_snowflake_read_connection(schema=SNOWFLAKE_SCHEMA):
+    options = dict(
+        user=SNOWFLAKE_USER,
+        password=SNOWFLAKE_PASSWORD,
+        account=SNOWFLAKE_ACCOUNT,
+        database=SNOWFLAKE_DATABASE,
+        schema=schema,
+        warehouse=SNOWFLAKE_READ_WAREHOUSE,
+        login_timeout=SNOWFLAKE_LOGIN_TIMEOUT,
+        network_timeout=SNOWFLAKE_NETWORK_TIMEOUT
+    )
+    if SNOWFLAKE_READ_ROLE:
+        options['role'] = SNOWFLAKE_READ_ROLE
+    return snowflake.connector.connect(**options)
+
+# Function to add the columns in SNOWFLAKE_ADDED_COLUMNS to the connection's schema (safe to run on every start)
+def migrate_snowflake_schema(connection):
+    cursor = connection.cursor()
+    try:
+        for table, column, column_type in SNOWFLAKE_ADDED_COLUMNS:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type}")
+    finally:
+        cursor.close()